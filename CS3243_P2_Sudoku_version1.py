@@ -5,6 +5,14 @@ import time
 # Running script: given code can be run with the command:
 # python file.py, ./path/to/init_state.txt ./output/output.txt
 
+# coordinates of the 20 cells sharing a row, collumn or 3x3 box with each cell
+PEERS = [[[(i, j) for i in range(9) for j in range(9)
+           if (i, j) != (row, col) and (i == row or j == col or (i // 3, j // 3) == (row // 3, col // 3))]
+          for col in range(9)] for row in range(9)]
+
+# copy of a tuple with the item at position replaced
+def replaced(items, position, item):
+    return items[:position] + (item,) + items[position + 1:]
 
 class Cell:
     def __init__(self,value):
@@ -81,16 +89,16 @@ class Node:
         return None
 
     def assign(self):
-        list_of_new_nodes = list()
-        (row, col) = self.choose_cell_to_assign()
-        domain = self.matrix[row][col].domain
-        for new_value in domain:
-            new_node = copy.deepcopy(self)
-            new_node.matrix[row][col].set_value(new_value)
-            new_node = new_node.validate_assignment(row, col)
-            if new_node:
-                list_of_new_nodes.append(new_node)
-        return list_of_new_nodes
+        return list(Children(self))
+
+    def domain(self, row, col):
+        return self.matrix[row][col].domain
+
+    #the node with value assigned at (row, col), or None if the assignment leaves a cell without any value
+    def child(self, row, col, value):
+        new_node = copy.deepcopy(self)
+        new_node.matrix[row][col].set_value(value)
+        return new_node.validate_assignment(row, col)
 
     #check if the value assignment at coordinate (row,col) is valid
     def validate_assignment(self, row, col):
@@ -115,35 +123,149 @@ class Node:
                     return False
         return True
 
+# Node that shares its structure with its parent instead of being deep copied. The values are a tuple of row
+# tuples and the constraints are tuples of frozensets, so a child only rebuilds the row and the 3 constraints
+# changed by its assignment and shares everything else. Domains are computed from the constraints on demand.
+class PersistentNode:
+    def __init__(self, rows, row_constraints, col_constraints, box_constraints):
+        self.rows = rows # tuple of 9 row tuples of values
+        self.row_constraints = row_constraints # tuple of frozensets of values that haven't appeared in each row
+        self.col_constraints = col_constraints # same for each collumn
+        self.box_constraints = box_constraints # same for each 3x3 box, numbered row // 3 * 3 + col // 3
+
+    #build the root node from the given input
+    @staticmethod
+    def from_puzzle(puzzle):
+        node = Node(puzzle)
+        return PersistentNode(tuple(tuple(row) for row in puzzle),
+                              tuple(frozenset(values) for values in node.row_constraints),
+                              tuple(frozenset(values) for values in node.col_constraints),
+                              tuple(frozenset(values) for box_row in node.box_constraints for values in box_row))
+
+    def __str__(self):
+        out = ""
+        for row in range(9):
+            for col in range(9):
+                out = out + " " + str(self.rows[row][col])
+            out = out + "\n"
+        return out
+
+    def domain(self, row, col):
+        return self.row_constraints[row].intersection(self.col_constraints[col],
+                                                      self.box_constraints[row // 3 * 3 + col // 3])
+
+    #choose the coordinate of the next cell to be assigned
+    def choose_cell_to_assign(self):
+        for row in range(9):
+            for col in range(9):
+                if self.rows[row][col] == 0:
+                    return (row, col)
+        return None
+
+    def assign(self):
+        return list(Children(self))
+
+    #the node with value assigned at (row, col), or None if the assignment leaves a cell without any value
+    #only the peers of (row, col) can lose a value, so they are the only cells checked
+    def child(self, row, col, value):
+        box = row // 3 * 3 + col // 3
+        removed = frozenset([value])
+        node = PersistentNode(replaced(self.rows, row, replaced(self.rows[row], col, value)),
+                              replaced(self.row_constraints, row, self.row_constraints[row] - removed),
+                              replaced(self.col_constraints, col, self.col_constraints[col] - removed),
+                              replaced(self.box_constraints, box, self.box_constraints[box] - removed))
+        for (i, j) in PEERS[row][col]:
+            if node.rows[i][j] == 0 and len(node.domain(i, j)) == 0:
+                return None
+        return node
+
+    def is_answer(self):
+        for row in self.rows:
+            if 0 in row:
+                return False
+        return True
+
+# Iterator over the valid children of a node for the next cell to be assigned, building each child only when
+# it is asked for. It lets go of the node once the last value has been tried, and keeps no reference to the
+# children it returns, so a stack of these holds at most one node per level that still has values to try.
+class Children:
+    def __init__(self, node):
+        (self.row, self.col) = node.choose_cell_to_assign()
+        self.values = list(node.domain(self.row, self.col))
+        self.node = node
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        while self.values:
+            node = self.node
+            new_value = self.values.pop(0)
+            if not self.values:
+                self.node = None
+            new_node = node.child(self.row, self.col, new_value)
+            if new_node:
+                return new_node
+        self.node = None
+        raise StopIteration
+
+    __next__ = next
+
 class Sudoku(object):
-    def __init__(self, puzzle):
+    def __init__(self, puzzle, persistent=True, lazy=True):
         # you may add more attributes if you need
         self.puzzle = puzzle # self.puzzle is a list of lists
         self.ans = copy.deepcopy(puzzle) # self.ans is a list of lists
+        self.persistent = persistent # share structure between nodes instead of deep copying them
+        self.lazy = lazy # keep child iterators on the stack instead of every child of each expanded node
+
+        self.time = 0
+        self.count = 0
+        self.max_stack = 0 # largest number of nodes, or child iterators when lazy, waiting on the stack
 
     # def generate_domains
 
     def solve(self):
         # TODO: Write your code here
         start_time = time.time()
-        start_node = Node(self.puzzle)
+        if self.persistent:
+            start_node = PersistentNode.from_puzzle(self.puzzle)
+        else:
+            start_node = Node(self.puzzle)
         stack = list()
-        stack.append(start_node)
+        if self.lazy:
+            stack.append(iter([start_node]))
+        else:
+            stack.append(start_node)
         count = 0
 
         while len(stack) > 0:
-            curr_node = stack.pop()
+            self.max_stack = max(self.max_stack, len(stack))
+            if self.lazy:
+                curr_node = next(stack[-1], None)
+                if curr_node is None:
+                    stack.pop()
+                    continue
+            else:
+                curr_node = stack.pop()
             count += 1
             # print(str(curr_node))
             if curr_node.is_answer():
                 end_time = time.time()
+                self.time = end_time - start_time
+                self.count = count
                 print("Version: BackTracking Search only")
                 print("Time elapsed " + str(end_time - start_time))
                 print("Number of Node traversed: " + str(count))
                 return self.puzzle
-            list_of_new_nodes = curr_node.assign()
-            while len(list_of_new_nodes) > 0:
-                stack.append(list_of_new_nodes.pop())
+            if self.lazy:
+                stack.append(Children(curr_node))
+            else:
+                list_of_new_nodes = curr_node.assign()
+                while len(list_of_new_nodes) > 0:
+                    stack.append(list_of_new_nodes.pop())
+        self.time = time.time() - start_time
+        self.count = count
         # self.ans is a list of lists
         return self.puzzle
 
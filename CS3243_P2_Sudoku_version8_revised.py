@@ -112,7 +112,7 @@ class SudokuPuzzle:
                     domain_changes[(i, j)] = set([new_value])
 
         # only runs AC_3 at after every 20 assignments
-        if self.no_of_assignment % 20 == 0 or self.depth = 80:
+        if self.no_of_assignment % 20 == 0 or self.depth == 80:
             self.AC_3(domain_changes)
 
     # unassign a value from a cell and revert changes to domains and neighbors set
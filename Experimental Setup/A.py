@@ -1,11 +1,18 @@
 import sys
 import copy
 import time
+from search import IterativeSearch, BackjumpingSearch
+from tables import CELLS, ROW_OF, COL_OF, BOX_OF, PEERS
+from zobrist import ZOBRIST, zobristHash
 
 # Running script: given code can be run with the command:
 # python file.py, ./path/to/init_state.txt ./output/output.txt
 
 # Variant (A): Most Constrained Variable + Forward Checking
+#
+# With backjumping, the search jumps back to the deepest assignment that took part in a failure instead of
+# the previous one (see search.py). The conflicts come from forward checking: every cell keeps the assigned
+# cells that pruned its domain, so backjumping needs incremental forward checking.
 
 def setCopy(values):
     set_copy = set()
@@ -26,16 +33,21 @@ class Cell:
         return str(self.value)
 
 class SudokuPuzzle:
-    def __init__(self, matrix, row_constraints, col_constraints, box_constraints):
+    def __init__(self, matrix, row_constraints, col_constraints, box_constraints, incremental=True):
         self.matrix = matrix
+        self.cells = [matrix[ROW_OF[index]][COL_OF[index]] for index in CELLS] # flat view of matrix
+        self.hash = zobristHash([cell.value for cell in self.cells]) # Zobrist hash of the values, kept by assign
         self.row_constraints = row_constraints
         self.col_constraints = col_constraints
         self.box_constraints = box_constraints
+        self.incremental = incremental # forward check only the peers of each assigned cell
+        self.pruned = [] # peers whose domain lost the assigned value, for each assignment in incremental mode
+        self.pruned_by = [[] for index in CELLS] # assigned cells that pruned the domain of each cell, in order
         self.initialize_domains()
         self.count = 0 # number of states traversed
 
     def __hash__(self):
-        return hash(str(self.matrix))
+        return self.hash
 
     def __str__(self):
         out = ""
@@ -47,49 +59,67 @@ class SudokuPuzzle:
 
     #initialize the domain of each cell inside the Sudoku puzzle
     def initialize_domains(self):
-        for row in range(9):
-            for col in range(9):
-                domain = self.row_constraints[row].intersection(self.col_constraints[col],
-                                                                self.box_constraints[row//3][col//3])
-                self.matrix[row][col].domain = domain
+        for index in CELLS:
+            self.cells[index].domain = self.row_constraints[ROW_OF[index]].intersection(
+                self.col_constraints[COL_OF[index]], self.box_constraints[BOX_OF[index]])
 
     # choose the coordinate of the next cell to be assigned
     # heuristcs implemented: Most Constrained Variable
     def choose_cell_to_assign(self):
         min_domain = 100
-        chosen_row = None
-        chosen_col = None
-        for row in range(9):
-            for col in range(9):
-                if self.matrix[row][col].value == 0:
-                    if len(self.matrix[row][col].domain) < min_domain:
-                        min_domain = len(self.matrix[row][col].domain)
-                        chosen_row = row
-                        chosen_col = col
-        return (chosen_row, chosen_col)
+        chosen = None
+        for index in CELLS:
+            if self.cells[index].value == 0:
+                if len(self.cells[index].domain) < min_domain:
+                    min_domain = len(self.cells[index].domain)
+                    chosen = index
+        return chosen
+
+    # remove the assigned value from the domains of the unassigned peers of index, and remember those peers
+    def forward_check(self, index, new_value):
+        pruned = []
+        for peer in PEERS[index]:
+            if self.cells[peer].value == 0 and new_value in self.cells[peer].domain:
+                self.cells[peer].domain.remove(new_value)
+                self.pruned_by[peer].append(index)
+                pruned.append(peer)
+        self.pruned.append(pruned)
+
+    # give the assigned value back to the peers that lost it in the last forward check
+    def undo_forward_check(self, new_value):
+        for peer in self.pruned.pop():
+            self.cells[peer].domain.add(new_value)
+            self.pruned_by[peer].pop()
 
     #assign a value to a cell and update domains and constraints
-    def assign(self, row, col, new_value):
-        self.matrix[row][col].value = new_value
-        self.row_constraints[row].remove(new_value)
-        self.col_constraints[col].remove(new_value)
-        self.box_constraints[row // 3][col // 3].remove(new_value)
-        self.initialize_domains()
+    def assign(self, index, new_value):
+        self.cells[index].value = new_value
+        self.hash ^= ZOBRIST[index][new_value]
+        self.row_constraints[ROW_OF[index]].remove(new_value)
+        self.col_constraints[COL_OF[index]].remove(new_value)
+        self.box_constraints[BOX_OF[index]].remove(new_value)
+        if self.incremental:
+            self.forward_check(index, new_value)
+        else:
+            self.initialize_domains()
 
     #unassign a value from a cell and update domains and constraints
-    def undo_assign(self, row, col, new_value):
-        self.matrix[row][col].value = 0
-        self.row_constraints[row].add(new_value)
-        self.col_constraints[col].add(new_value)
-        self.box_constraints[row // 3][col // 3].add(new_value)
-        self.initialize_domains()
+    def undo_assign(self, index, new_value):
+        self.hash ^= ZOBRIST[index][self.cells[index].value]
+        self.cells[index].value = 0
+        self.row_constraints[ROW_OF[index]].add(new_value)
+        self.col_constraints[COL_OF[index]].add(new_value)
+        self.box_constraints[BOX_OF[index]].add(new_value)
+        if self.incremental:
+            self.undo_forward_check(new_value)
+        else:
+            self.initialize_domains()
 
     #check if the curent Sudoku puzzle is valid
     def is_valid(self):
-        for i in range(9):
-            for j in range(9):
-                if self.matrix[i][j].value == 0 and len(self.matrix[i][j].domain) == 0:
-                    return False
+        for index in CELLS:
+            if self.cells[index].value == 0 and len(self.cells[index].domain) == 0:
+                return False
         return True
 
     def backtrack_search(self):
@@ -98,39 +128,66 @@ class SudokuPuzzle:
             return True
         if not self.is_valid():
             return False
-        (row, col) = self.choose_cell_to_assign()
-        domain_copy = self.matrix[row][col].domain.copy()
+        index = self.choose_cell_to_assign()
+        domain_copy = self.cells[index].domain.copy()
         for new_value in domain_copy:
-            self.assign(row, col, new_value)
+            self.assign(index, new_value)
             result = self.backtrack_search()
             if result is True:
                 return True
             else:
-                self.undo_assign(row, col, new_value)
+                self.undo_assign(index, new_value)
+
+    # assigned cells whose values were pruned from the domain of a cell, for backjumping
+    def culprits(self, index):
+        return self.pruned_by[index]
+
+    # assigned cells that emptied the domain of a cell, for backjumping
+    # only the peers pruned by the last assignment can have been emptied
+    def wipeout_culprits(self):
+        for peer in self.pruned[-1]:
+            if len(self.cells[peer].domain) == 0:
+                return self.pruned_by[peer]
+        return []
+
+    # values to try at a cell, for the iterative search driver
+    def values_to_assign(self, index):
+        return self.cells[index].domain.copy()
+
+    # assign a value for the iterative search driver, the value itself is enough to undo it
+    def make_choice(self, index, new_value):
+        self.assign(index, new_value)
+        return new_value, True
+
+    def retract_choice(self, index, new_value):
+        self.undo_assign(index, new_value)
 
     def is_answer(self):
-        for row in range(9):
-            for col in range(9):
-                if self.matrix[row][col].value == 0:
-                    return False
+        for index in CELLS:
+            if self.cells[index].value == 0:
+                return False
         return True
 
 class Sudoku(object):
-    def __init__(self, puzzle):
+    def __init__(self, puzzle, incremental=True, backjumping=False):
         # you may add more attributes if you need
         self.puzzle = puzzle # self.puzzle is a list of lists
+        self.incremental = incremental or backjumping # forward check only the peers of each assigned cell, instead of rebuilding every domain
+        self.backjumping = backjumping # jump back to the deepest assignment responsible for a failure
         self.ans = puzzleCopy(puzzle) # self.ans is a list of lists
 
         self.matrix = self.initialize_cells(self.puzzle)
 
         self.row_constraints = [set([1, 2, 3, 4, 5, 6, 7, 8, 9]) for i in range(9)] #set of values that haven't appeared in each row
         self.col_constraints = [set([1, 2, 3, 4, 5, 6, 7, 8, 9]) for i in range(9)] #set of values that haven't appeared in each collumn
-        self.box_constraints = [[set([1, 2, 3, 4, 5, 6, 7, 8, 9]) for i in range(3)] for j in range(3)] #set of values that haven't appeared in each 3x3 box
+        self.box_constraints = [set([1, 2, 3, 4, 5, 6, 7, 8, 9]) for i in range(9)] #set of values that haven't appeared in each 3x3 box
         
         self.initialize_constraints()
 
         self.time = 0
         self.count = 0
+        self.backjumps = 0
+        self.levels_skipped = 0
 
     #initialize the value inside each cell with given input
     def initialize_cells(self,puzzle):
@@ -142,13 +199,12 @@ class Sudoku(object):
 
     #initialize the row, collumn, and 3x3 box constraints of the Sudoku puzzle
     def initialize_constraints(self):
-        for row in range(9):
-            for col in range(9):
-                value = self.matrix[row][col].value
-                if value != 0:
-                    self.row_constraints[row].remove(value)
-                    self.col_constraints[col].remove(value)
-                    self.box_constraints[row//3][col//3].remove(value)
+        for index in CELLS:
+            value = self.matrix[ROW_OF[index]][COL_OF[index]].value
+            if value != 0:
+                self.row_constraints[ROW_OF[index]].remove(value)
+                self.col_constraints[COL_OF[index]].remove(value)
+                self.box_constraints[BOX_OF[index]].remove(value)
 
 
     # def generate_domains
@@ -156,14 +212,23 @@ class Sudoku(object):
     def solve(self):
         # TODO: Write your code here
         start_time = time.time()
-        sudokuPuzzle = SudokuPuzzle(self.matrix, self.row_constraints, self.col_constraints, self.box_constraints)
-        sudokuPuzzle.backtrack_search()
+        sudokuPuzzle = SudokuPuzzle(self.matrix, self.row_constraints, self.col_constraints, self.box_constraints,
+                                    self.incremental)
+        if self.backjumping:
+            search = BackjumpingSearch(sudokuPuzzle)
+            search.run()
+            self.backjumps = search.backjumps
+            self.levels_skipped = search.levels_skipped
+        else:
+            IterativeSearch(sudokuPuzzle).run()
         end_time = time.time()
         self.time = end_time - start_time
         self.count = sudokuPuzzle.count
         print("Variant (A): Most Constrained Variable + Forward Checking")
         print("Time elapsed " + str(end_time - start_time))
         print("Number of states traversed: " + str(sudokuPuzzle.count))
+        if self.backjumping:
+            print("Backjumps: " + str(self.backjumps) + ", levels skipped: " + str(self.levels_skipped))
         return sudokuPuzzle.matrix
 
     # you may add more classes/functions if you think is useful
@@ -1,6 +1,10 @@
 import sys
 import copy
 import time
+from search import IterativeSearch
+from weights import ConstraintWeights
+from tables import CELLS, ROW_OF, COL_OF, BOX_OF, PEERS
+from zobrist import ZOBRIST, zobristHash
 
 # Running script: given code can be run with the command:
 # python file.py, ./path/to/init_state.txt ./output/output.txt
@@ -27,17 +31,24 @@ class Cell:
         return str(self.value)
 
 class SudokuPuzzle:
-    def __init__(self,matrix,row_constraints,col_constraints,box_constraints):
+    def __init__(self, matrix, row_constraints, col_constraints, box_constraints, incremental=True, weighted=False):
         self.matrix = matrix
+        self.cells = [matrix[ROW_OF[index]][COL_OF[index]] for index in CELLS] # flat view of matrix
+        self.hash = zobristHash([cell.value for cell in self.cells]) # Zobrist hash of the values, kept by assign
         self.row_constraints = row_constraints
         self.col_constraints = col_constraints
         self.box_constraints = box_constraints
+        self.incremental = incremental # forward check only the peers of each assigned cell
+        self.pruned = [] # peers whose domain lost the assigned value, for each assignment in incremental mode
+        self.weights = None # unit weights for dom/wdeg, None to break ties by static degree
+        if weighted:
+            self.weights = ConstraintWeights([cell.value for cell in self.cells])
         self.initialize_domains()
         self.initialize_neighbors()
         self.count = 0
 
     def __hash__(self):
-        return hash(str(self.matrix))
+        return self.hash
 
     def __str__(self):
         out = ""
@@ -49,87 +60,116 @@ class SudokuPuzzle:
 
     #initialize the domain of each cell inside the Sudoku puzzle
     def initialize_domains(self):
-        for row in range(9):
-            for col in range(9):
-                domain = self.row_constraints[row].intersection(self.col_constraints[col],
-                                                                self.box_constraints[row//3][col//3])
-                self.matrix[row][col].domain = domain
+        for index in CELLS:
+            self.cells[index].domain = self.row_constraints[ROW_OF[index]].intersection(
+                self.col_constraints[COL_OF[index]], self.box_constraints[BOX_OF[index]])
 
     # initialize the neighbors of each cell inside the Sudoku puzzle
     def initialize_neighbors(self):
-        for row in range(9):
-            for col in range(9):
-                self.matrix[row][col].neighbors = self.find_neighbors(row, col)
+        for index in CELLS:
+            self.cells[index].neighbors = self.find_neighbors(index)
 
-    # find all unassigned neighbor cells of the cell at coordinate (row, col)
-    def find_neighbors(self, row, col):
-        neighbors = set()
-        for i in range(9):
-            if i != row and self.matrix[i][col].value == 0:
-                neighbors.add((i, col))
-            if i != col and self.matrix[row][i].value == 0:
-                neighbors.add((row, i))
-        box_row = row // 3 * 3
-        box_col = col // 3 * 3
-        for i in range(box_row, box_row + 3):
-            for j in range(box_col, box_col + 3):
-                if i != row and j != col and self.matrix[i][j].value == 0:
-                    neighbors.add((i, j))
-        return neighbors
+    # find the indices of all unassigned neighbor cells of the cell at index
+    def find_neighbors(self, index):
+        return set(peer for peer in PEERS[index] if self.cells[peer].value == 0)
+
+    # choose the unassigned cell with the smallest domain size over weighted degree
+    # heuristics: dom/wdeg, ties broken by Most Constraining Variable
+    def choose_cell_by_weight(self):
+        min_ratio = None
+        max_degree = -1
+        chosen = None
+        for index in CELLS:
+            if self.cells[index].value == 0:
+                ratio = self.weights.ratio(len(self.cells[index].domain), index)
+                degree = len(self.cells[index].neighbors)
+                if min_ratio is None or ratio < min_ratio or (ratio == min_ratio and degree > max_degree):
+                    min_ratio = ratio
+                    max_degree = degree
+                    chosen = index
+        return chosen
 
     #choose the coordinate of the next cell to be assigned
     #heuristcs implemented: Most Constrained Variable with Most Constraining Variable
     def choose_cell_to_assign(self):
+        if self.weights is not None:
+            return self.choose_cell_by_weight()
         min_domain = 100
         max_degree = -1
-        chosen_row = None
-        chosen_col = None
-        for row in range(9):
-            for col in range(9):
-                if self.matrix[row][col].value == 0:
-                    domain_size = len(self.matrix[row][col].domain)
-                    if domain_size < min_domain:
-                        min_domain = domain_size
-                        chosen_row = row
-                        chosen_col = col
-                    elif domain_size == min_domain:
-                        degree = len(self.matrix[row][col].neighbors)
-                        if degree > max_degree:
-                            max_degree = degree
-                            chosen_row = row
-                            chosen_col = col
-        return (chosen_row, chosen_col)
+        chosen = None
+        for index in CELLS:
+            if self.cells[index].value == 0:
+                domain_size = len(self.cells[index].domain)
+                if domain_size < min_domain:
+                    min_domain = domain_size
+                    chosen = index
+                elif domain_size == min_domain:
+                    degree = len(self.cells[index].neighbors)
+                    if degree > max_degree:
+                        max_degree = degree
+                        chosen = index
+        return chosen
+
+    # remove the assigned value from the domains of the unassigned peers of index, and remember those peers
+    def forward_check(self, index, new_value):
+        pruned = []
+        for peer in self.cells[index].neighbors:
+            if new_value in self.cells[peer].domain:
+                self.cells[peer].domain.remove(new_value)
+                pruned.append(peer)
+        self.pruned.append(pruned)
+
+    # give the assigned value back to the peers that lost it in the last forward check
+    def undo_forward_check(self, new_value):
+        for peer in self.pruned.pop():
+            self.cells[peer].domain.add(new_value)
 
     #assign a value to a cell and update domains and constraints
-    def assign(self, row, col, new_value):
-        self.matrix[row][col].value = new_value
-        self.row_constraints[row].remove(new_value)
-        self.col_constraints[col].remove(new_value)
-        self.box_constraints[row // 3][col // 3].remove(new_value)
-
-        for i, j in self.matrix[row][col].neighbors:
-            self.matrix[i][j].neighbors.remove((row, col))
-
-        self.initialize_domains()
+    def assign(self, index, new_value):
+        self.cells[index].value = new_value
+        self.hash ^= ZOBRIST[index][new_value]
+        self.row_constraints[ROW_OF[index]].remove(new_value)
+        self.col_constraints[COL_OF[index]].remove(new_value)
+        self.box_constraints[BOX_OF[index]].remove(new_value)
+
+        for i in self.cells[index].neighbors:
+            self.cells[i].neighbors.remove(index)
+
+        if self.incremental:
+            self.forward_check(index, new_value)
+        else:
+            self.initialize_domains()
+
+        if self.weights is not None:
+            self.weights.assign(index)
+            for i in self.cells[index].neighbors:
+                if len(self.cells[i].domain) == 0:
+                    self.weights.bump(i, index)
 
     #unassign a value from a cell and update domains and constraints
-    def undo_assign(self, row, col, new_value):
-        self.matrix[row][col].value = 0
-        self.row_constraints[row].add(new_value)
-        self.col_constraints[col].add(new_value)
-        self.box_constraints[row // 3][col // 3].add(new_value)
+    def undo_assign(self, index, new_value):
+        self.hash ^= ZOBRIST[index][self.cells[index].value]
+        self.cells[index].value = 0
+        self.row_constraints[ROW_OF[index]].add(new_value)
+        self.col_constraints[COL_OF[index]].add(new_value)
+        self.box_constraints[BOX_OF[index]].add(new_value)
 
-        for i, j in self.matrix[row][col].neighbors:
-            self.matrix[i][j].neighbors.add((row, col))
+        for i in self.cells[index].neighbors:
+            self.cells[i].neighbors.add(index)
 
-        self.initialize_domains()
+        if self.incremental:
+            self.undo_forward_check(new_value)
+        else:
+            self.initialize_domains()
+
+        if self.weights is not None:
+            self.weights.unassign(index)
 
     #check if the value assignment at coordinate (row,col) is valid
     def is_valid(self):
-        for i in range(9):
-            for j in range(9):
-                if self.matrix[i][j].value == 0 and len(self.matrix[i][j].domain) == 0:
-                    return False
+        for index in CELLS:
+            if self.cells[index].value == 0 and len(self.cells[index].domain) == 0:
+                return False
         return True
 
     def backtrack_search(self):
@@ -138,39 +178,53 @@ class SudokuPuzzle:
             return True
         if not self.is_valid():
             return False
-        (row, col) = self.choose_cell_to_assign()
-        domain_copy = self.matrix[row][col].domain.copy()
+        index = self.choose_cell_to_assign()
+        domain_copy = self.cells[index].domain.copy()
         for new_value in domain_copy:
-            self.assign(row, col, new_value)
+            self.assign(index, new_value)
             result = self.backtrack_search()
             if result is True:
                 return True
             else:
-                self.undo_assign(row, col, new_value)
+                self.undo_assign(index, new_value)
+
+    # values to try at a cell, for the iterative search driver
+    def values_to_assign(self, index):
+        return self.cells[index].domain.copy()
+
+    # assign a value for the iterative search driver, the value itself is enough to undo it
+    def make_choice(self, index, new_value):
+        self.assign(index, new_value)
+        return new_value, True
+
+    def retract_choice(self, index, new_value):
+        self.undo_assign(index, new_value)
 
     def is_answer(self):
-        for row in range(9):
-            for col in range(9):
-                if self.matrix[row][col].value == 0:
-                    return False
+        for index in CELLS:
+            if self.cells[index].value == 0:
+                return False
         return True
 
 class Sudoku(object):
-    def __init__(self, puzzle):
+    def __init__(self, puzzle, incremental=True, weighted=False):
         # you may add more attributes if you need
         self.puzzle = puzzle # self.puzzle is a list of lists
+        self.incremental = incremental # forward check only the peers of each assigned cell, instead of rebuilding every domain
+        self.weighted = weighted # order cells by dom/wdeg instead of domain size and static degree
         self.ans = puzzleCopy(puzzle) # self.ans is a list of lists
 
         self.matrix = self.initialize_cells(self.puzzle)
 
         self.row_constraints = [set([1, 2, 3, 4, 5, 6, 7, 8, 9]) for i in range(9)] #set of values that haven't appeared in each row
         self.col_constraints = [set([1, 2, 3, 4, 5, 6, 7, 8, 9]) for i in range(9)] #set of values that haven't appeared in each collumn
-        self.box_constraints = [[set([1, 2, 3, 4, 5, 6, 7, 8, 9]) for i in range(3)] for j in range(3)] #set of values that haven't appeared in each 3x3 box
+        self.box_constraints = [set([1, 2, 3, 4, 5, 6, 7, 8, 9]) for i in range(9)] #set of values that haven't appeared in each 3x3 box
         
         self.initialize_constraints()
 
         self.time = 0
         self.count = 0
+        self.weight_bumps = 0
 
     #initialize the value inside each cell with given input
     def initialize_cells(self,puzzle):
@@ -182,27 +236,31 @@ class Sudoku(object):
 
     #initialize the row, collumn, and 3x3 box constraints of the Sudoku puzzle
     def initialize_constraints(self):
-        for row in range(9):
-            for col in range(9):
-                value = self.matrix[row][col].value
-                if value != 0:
-                    self.row_constraints[row].remove(value)
-                    self.col_constraints[col].remove(value)
-                    self.box_constraints[row//3][col//3].remove(value)
+        for index in CELLS:
+            value = self.matrix[ROW_OF[index]][COL_OF[index]].value
+            if value != 0:
+                self.row_constraints[ROW_OF[index]].remove(value)
+                self.col_constraints[COL_OF[index]].remove(value)
+                self.box_constraints[BOX_OF[index]].remove(value)
 
     # def generate_domains
 
     def solve(self):
         # TODO: Write your code here
         start_time = time.time()
-        sudokuPuzzle = SudokuPuzzle(self.matrix, self.row_constraints, self.col_constraints, self.box_constraints)
-        sudokuPuzzle.backtrack_search()
+        sudokuPuzzle = SudokuPuzzle(self.matrix, self.row_constraints, self.col_constraints, self.box_constraints,
+                                    self.incremental, self.weighted)
+        IterativeSearch(sudokuPuzzle).run()
         end_time = time.time()
         self.time = end_time - start_time
         self.count = sudokuPuzzle.count
+        if sudokuPuzzle.weights is not None:
+            self.weight_bumps = sudokuPuzzle.weights.bumps
         print("Variant (B): Most Constrained Variable with Most Constraining Variable + Forward Checking")
         print("Time elapsed " + str(end_time - start_time))
         print("Number of states traversed: " + str(sudokuPuzzle.count))
+        if sudokuPuzzle.weights is not None:
+            print("Constraint weight bumps: " + str(sudokuPuzzle.weights.bumps))
         return sudokuPuzzle.matrix
 
     # you may add more classes/functions if you think is useful
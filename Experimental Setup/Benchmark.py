@@ -0,0 +1,331 @@
+import os
+import sys
+import imp
+import time
+import resource
+import multiprocessing
+import Experiment
+import A as algoA
+import B as algoB
+import C as algoC
+import D as algoD
+import E as algoE
+import F as algoF
+import I as algoI
+import propagators
+
+# Running script: python Benchmark.py [easy|moderate|difficult] [version8|policies|techniques|lcv|forward-checking|version1|lazy|wdeg|restarts|backjumping|scaling|bitboard]
+# version8: compares the bitmask engine (F) against version 8 on one tier of the test cases.
+# Version 8 tries values in set iteration order while F tries them in ascending order, so the
+# number of states can differ; us/state is the per-node cost of each engine.
+# policies: runs F with each propagation policy and reports how often it propagated and what that pruned.
+# techniques: runs F with several mixes of logical techniques and reports the total time of each mix on the
+# tier, with the calls, eliminations and time of every technique.
+# lcv: compares variant C, which orders values by Least Constraining Value, against variant B, which tries
+# them in set order, to show the states saved by the value ordering.
+# forward-checking: runs variants A, B and C once rebuilding all 81 domains after every assignment and once
+# forward checking only the peers of the assigned cell.
+# version1: runs version 1 with deep copied nodes and with persistent nodes, each puzzle in its own process
+# so that the peak memory of each run can be told apart, and reports nodes/sec and the growth of peak memory.
+# lazy: same report for version 1 expanding all children of a node at once or one at a time from an iterator.
+# wdeg: runs variants B to E ordering cells by domain size and degree, then by dom/wdeg, and reports the total
+# and the worst number of states on the tier next to the total time.
+# restarts: runs F on every puzzle of the tier with several seeds for the tie-breaking between cells, without
+# restarts and with each restart schedule, and reports the distribution of the time and states of the runs.
+# backjumping: runs variant A backtracking chronologically and with conflict-directed backjumping, and reports
+# the states of both with the number of backjumps and of levels they skipped.
+# scaling: runs F on generated 9x9, 16x16, 25x25 and 36x36 boards with 40% of their cells empty, each puzzle in
+# its own process, and reports the states/sec and the growth of peak memory, tables of the board included,
+# as the board grows. The 9x9 tables are built when F is imported, so they are left out of that growth.
+# Ignores the tier.
+# bitboard: compares the digit-plane engine (I) with the bitmask engine (F), with the bytes that one saved
+# state of I takes.
+
+def loadVersion(name):
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    return imp.load_source(name, os.path.join(dir_path, os.pardir, name + ".py"))
+
+def getTierFiles(tier):
+    dir_path = os.path.dirname(os.path.realpath(__file__))
+    return Experiment.filePath(dir_path + "/testcases/" + tier)
+
+# solve a puzzle with a version-style module, which only reports its counters by printing
+def runVersion(module, puzzle):
+    sudoku = module.Sudoku(puzzle)
+    start_time = time.time()
+    sudokuPuzzle = module.SudokuPuzzle(sudoku.matrix, sudoku.row_constraints, sudoku.col_constraints,
+                                       sudoku.box_constraints, sudoku.depth)
+    sudokuPuzzle.backtrack_search()
+    return time.time() - start_time, sudokuPuzzle.count
+
+# solve a variant-style Sudoku object without its printed report, and return it to read its counters
+def solveQuietly(sudoku):
+    stdout = sys.stdout
+    sys.stdout = open(os.devnull, 'w')
+    try:
+        sudoku.solve()
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    return sudoku
+
+# solve a puzzle with a variant-style module, which keeps its counters on the Sudoku object
+def runVariant(module, puzzle):
+    sudoku = solveQuietly(module.Sudoku(puzzle))
+    return sudoku.time, sudoku.count
+
+def runBenchmark(tier, repeat=3):
+    version8 = loadVersion("CS3243_P2_Sudoku_version8_revised")
+    rows = []
+    for file_name in getTierFiles(tier):
+        puzzle = Experiment.extract_puzzle(file_name)
+        base_time, base_count = min(runVersion(version8, puzzle) for i in range(repeat))
+        new_time, new_count = min(runVariant(algoF, puzzle) for i in range(repeat))
+        rows.append([os.path.basename(file_name), base_time, base_count, 1e6 * base_time / base_count,
+                     new_time, new_count, 1e6 * new_time / new_count])
+    return rows
+
+def runPolicies(tier, policies):
+    rows = []
+    for file_name in getTierFiles(tier):
+        puzzle = Experiment.extract_puzzle(file_name)
+        for name in policies:
+            sudoku = solveQuietly(algoF.Sudoku(puzzle, algoF.POLICIES[name]()))
+            rows.append([os.path.basename(file_name), sudoku.policy.name, sudoku.time, sudoku.count,
+                         sudoku.propagations, sudoku.values_pruned, sudoku.wipeouts])
+    return rows
+
+TECHNIQUE_MIXES = [
+    [],
+    ["intersections"],
+    ["naked-pairs"],
+    ["hidden-pairs"],
+    ["intersections", "naked-pairs", "hidden-pairs"],
+    ["intersections", "naked-pairs", "naked-triples", "hidden-pairs", "hidden-triples"],
+    ["all-different"],
+    ["intersections", "all-different"],
+]
+
+def runTechniques(tier, mixes):
+    puzzles = [Experiment.extract_puzzle(file_name) for file_name in getTierFiles(tier)]
+    rows = []
+    for names in mixes:
+        techniques = propagators.makePropagators(names)
+        total_time = 0
+        total_count = 0
+        for puzzle in puzzles:
+            sudoku = solveQuietly(algoF.Sudoku(puzzle, propagators=techniques))
+            total_time += sudoku.time
+            total_count += sudoku.count
+        rows.append([",".join(names) or "none", total_time, total_count,
+                     "; ".join(str(technique) for technique in techniques)])
+    return rows
+
+def runValueOrdering(tier):
+    rows = []
+    for file_name in getTierFiles(tier):
+        puzzle = Experiment.extract_puzzle(file_name)
+        base_time, base_count = runVariant(algoB, puzzle)
+        new_time, new_count = runVariant(algoC, puzzle)
+        rows.append([os.path.basename(file_name), base_time, base_count, new_time, new_count])
+    return rows
+
+def runForwardChecking(tier, modules):
+    puzzles = [Experiment.extract_puzzle(file_name) for file_name in getTierFiles(tier)]
+    rows = []
+    for module in modules:
+        row = [module.__name__]
+        for incremental in [False, True]:
+            sudokus = [solveQuietly(module.Sudoku(puzzle, incremental)) for puzzle in puzzles]
+            row.extend([sum(sudoku.time for sudoku in sudokus), sum(sudoku.count for sudoku in sudokus)])
+        rows.append(row)
+    return rows
+
+# call solve in its own process, so that the peak memory of each run can be told apart, and return its
+# result tuple followed by the growth of peak memory in KB
+def runForked(solve):
+    results = multiprocessing.Queue()
+    def run():
+        start_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        result = solve()
+        peak_memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        results.put(result + (peak_memory - start_memory,))
+    process = multiprocessing.Process(target=run)
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+# solve with version 1 in a child process, returns (time, nodes, largest stack, growth of peak memory in KB)
+def runVersion1(puzzle, persistent, lazy):
+    version1 = loadVersion("CS3243_P2_Sudoku_version1")
+    def solve():
+        sudoku = solveQuietly(version1.Sudoku(puzzle, persistent, lazy))
+        return (sudoku.time, sudoku.count, sudoku.max_stack)
+    return runForked(solve)
+
+# (persistent, lazy) settings of version 1 compared by each mode
+VERSION1_MODES = {
+    "version1": [(False, False), (True, False)],
+    "lazy": [(False, False), (False, True), (True, False), (True, True)],
+}
+
+def runVersion1Modes(tier, settings):
+    rows = []
+    for file_name in getTierFiles(tier):
+        puzzle = Experiment.extract_puzzle(file_name)
+        for persistent, lazy in settings:
+            run_time, count, max_stack, memory = runVersion1(puzzle, persistent, lazy)
+            rows.append([os.path.basename(file_name), "shared" if persistent else "copy",
+                         "lazy" if lazy else "eager", count, count / run_time, max_stack, memory])
+    return rows
+
+def runWeighted(tier, modules):
+    puzzles = [Experiment.extract_puzzle(file_name) for file_name in getTierFiles(tier)]
+    rows = []
+    for module in modules:
+        row = [module.__name__]
+        for weighted in [False, True]:
+            sudokus = [solveQuietly(module.Sudoku(puzzle, weighted=weighted)) for puzzle in puzzles]
+            row.extend([sum(sudoku.time for sudoku in sudokus), sum(sudoku.count for sudoku in sudokus),
+                        max(sudoku.count for sudoku in sudokus)])
+        rows.append(row)
+    return rows
+
+# value at a fraction of the way through sorted values
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+# min, median, 90th and 99th percentiles, max and mean of values
+def distribution(values):
+    values = sorted(values)
+    return [values[0], percentile(values, 0.5), percentile(values, 0.9), percentile(values, 0.99), values[-1],
+            sum(values) / float(len(values))]
+
+def runRestarts(tier, schedules, seeds):
+    puzzles = [Experiment.extract_puzzle(file_name) for file_name in getTierFiles(tier)]
+    rows = []
+    for restarts in schedules:
+        sudokus = [solveQuietly(algoF.Sudoku(puzzle, restarts=restarts, seed=seed))
+                   for seed in seeds for puzzle in puzzles]
+        name = restarts if restarts is not None else "none"
+        rows.append([name, "time (ms)"] + distribution([sudoku.time * 1000 for sudoku in sudokus]))
+        rows.append([name, "states"] + distribution([sudoku.count for sudoku in sudokus]))
+        rows.append([name, "restarts"] + distribution([sudoku.restart_count for sudoku in sudokus]))
+    return rows
+
+def runBackjumping(tier):
+    rows = []
+    for file_name in getTierFiles(tier):
+        row = [os.path.basename(file_name)]
+        for backjumping in [False, True]:
+            sudoku = solveQuietly(algoA.Sudoku(Experiment.extract_puzzle(file_name), backjumping=backjumping))
+            row.extend([sudoku.time, sudoku.count])
+        row.extend([sudoku.backjumps, sudoku.levels_skipped])
+        rows.append(row)
+    return rows
+
+# bytes taken by the nine planes and the assigned cells that I saves before every assignment
+def planeStateSize(puzzle):
+    saved = (tuple(puzzle.planes), puzzle.assigned)
+    return (sys.getsizeof(saved) + sys.getsizeof(saved[0]) + sum(sys.getsizeof(plane) for plane in saved[0])
+            + sys.getsizeof(saved[1]))
+
+def runBitboard(tier):
+    rows = []
+    for file_name in getTierFiles(tier):
+        puzzle = Experiment.extract_puzzle(file_name)
+        row = [os.path.basename(file_name)]
+        for module in [algoF, algoI]:
+            run_time, count = runVariant(module, puzzle)
+            row.extend([run_time, count, run_time * 1e6 / count])
+        row.append(planeStateSize(algoI.SudokuPuzzle([puzzle[index // 9][index % 9] for index in range(81)])))
+        rows.append(row)
+    return rows
+
+BOARD_SIZES = [9, 16, 25, 36]
+
+def runScaling(sizes, seeds, empty_fraction=0.4):
+    rows = []
+    for size in sizes:
+        for seed in seeds:
+            puzzle = Experiment.generate_puzzle(size, empty_fraction, seed)
+            def solve():
+                sudoku = solveQuietly(algoF.Sudoku(puzzle, size=size))
+                return (sudoku.time, sudoku.count)
+            run_time, count, memory = runForked(solve)
+            rows.append([str(size) + "x" + str(size), seed, count, run_time, count / run_time, memory])
+    return rows
+
+def printRows(header, rows):
+    print("".join("%-16s" % title for title in header))
+    for row in rows:
+        print("".join(("%-16.5f" if isinstance(cell, float) else "%-16s") % cell for cell in row))
+
+if __name__ == "__main__":
+    tier = sys.argv[1] if len(sys.argv) > 1 else "difficult"
+    mode = sys.argv[2] if len(sys.argv) > 2 else "version8"
+    if mode == "policies":
+        policies = ["always", "every-k", "adaptive"]
+        rows = runPolicies(tier, policies)
+        printRows(['Test case', 'Policy', 'Time', 'States', 'Propagations', 'Values pruned', 'Wipeouts'], rows)
+        for name, policy_rows in zip(policies, [rows[i::len(policies)] for i in range(len(policies))]):
+            print("Total time (%s): %.5f, states: %d" % (name, sum(row[2] for row in policy_rows),
+                                                         sum(row[3] for row in policy_rows)))
+        sys.exit(0)
+    if mode == "techniques":
+        for row in runTechniques(tier, TECHNIQUE_MIXES):
+            print("%-70s time %.5f, states %d" % tuple(row[:3]))
+            if row[3]:
+                print("    " + row[3])
+        sys.exit(0)
+    if mode == "lcv":
+        rows = runValueOrdering(tier)
+        printRows(['Test case', 'Time (B)', 'States (B)', 'Time (C)', 'States (C)'], rows)
+        print("Total time: B %.5f, C %.5f; total states: B %d, C %d" % (
+            sum(row[1] for row in rows), sum(row[3] for row in rows),
+            sum(row[2] for row in rows), sum(row[4] for row in rows)))
+        sys.exit(0)
+    if mode == "forward-checking":
+        rows = runForwardChecking(tier, [algoA, algoB, algoC])
+        printRows(['Variant', 'Time (rebuild)', 'States', 'Time (peers)', 'States'], rows)
+        sys.exit(0)
+    if mode in VERSION1_MODES:
+        printRows(['Test case', 'Nodes', 'Children', 'States', 'States/s', 'Largest stack', 'Peak KB'],
+                  runVersion1Modes(tier, VERSION1_MODES[mode]))
+        sys.exit(0)
+    if mode == "wdeg":
+        printRows(['Variant', 'Time (degree)', 'States', 'Worst', 'Time (wdeg)', 'States', 'Worst'],
+                  runWeighted(tier, [algoB, algoC, algoD, algoE]))
+        sys.exit(0)
+    if mode == "restarts":
+        printRows(['Restarts', 'Measure', 'Min', 'p50', 'p90', 'p99', 'Max', 'Mean'],
+                  runRestarts(tier, [None, "luby", "geometric"], range(20)))
+        sys.exit(0)
+    if mode == "backjumping":
+        rows = runBackjumping(tier)
+        printRows(['Test case', 'Time', 'States', 'Time (CBJ)', 'States (CBJ)', 'Backjumps', 'Levels skipped'],
+                  rows)
+        print("Total states: chronological %d, backjumping %d, levels skipped %d" % (
+            sum(row[2] for row in rows), sum(row[4] for row in rows), sum(row[6] for row in rows)))
+        sys.exit(0)
+    if mode == "scaling":
+        rows = runScaling(BOARD_SIZES, range(3))
+        printRows(['Board', 'Seed', 'States', 'Time', 'States/s', 'Peak KB'], rows)
+        for size in BOARD_SIZES:
+            size_rows = [row for row in rows if row[0] == str(size) + "x" + str(size)]
+            print("%dx%d: %.1f states/s, %d KB" % (size, size, sum(row[2] for row in size_rows)
+                                                / sum(row[3] for row in size_rows), max(row[5] for row in size_rows)))
+        sys.exit(0)
+    if mode == "bitboard":
+        rows = runBitboard(tier)
+        printRows(['Test case', 'Time (F)', 'States (F)', 'us/state (F)', 'Time (I)', 'States (I)', 'us/state (I)',
+                   'State bytes (I)'], rows)
+        print("Total time: F %.5f, I %.5f" % (sum(row[1] for row in rows), sum(row[4] for row in rows)))
+        sys.exit(0)
+    rows = runBenchmark(tier)
+    printRows(['Test case', 'Time (v8)', 'States (v8)', 'us/state (v8)',
+               'Time (F)', 'States (F)', 'us/state (F)'], rows)
+    base_total = sum(row[1] for row in rows)
+    new_total = sum(row[4] for row in rows)
+    print("Total time: version 8 %.5f, variant F %.5f (%.2fx)" % (base_total, new_total, base_total / new_total))
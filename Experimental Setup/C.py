@@ -1,6 +1,10 @@
 import sys
 import copy
 import time
+from search import IterativeSearch
+from weights import ConstraintWeights
+from tables import CELLS, ROW_OF, COL_OF, BOX_OF, UNITS_OF, PEERS
+from zobrist import ZOBRIST, zobristHash
 
 # Running script: given code can be run with the command:
 # python file.py, ./path/to/init_state.txt ./output/output.txt
@@ -27,17 +31,25 @@ class Cell:
         return str(self.value)
 
 class SudokuPuzzle:
-    def __init__(self,matrix,row_constraints,col_constraints,box_constraints):
+    def __init__(self, matrix, row_constraints, col_constraints, box_constraints, incremental=True, weighted=False):
         self.matrix = matrix
+        self.cells = [matrix[ROW_OF[index]][COL_OF[index]] for index in CELLS] # flat view of matrix
+        self.hash = zobristHash([cell.value for cell in self.cells]) # Zobrist hash of the values, kept by assign
         self.row_constraints = row_constraints
         self.col_constraints = col_constraints
         self.box_constraints = box_constraints
+        self.incremental = incremental # forward check only the peers of each assigned cell
+        self.pruned = [] # peers whose domain lost the assigned value, for each assignment in incremental mode
+        self.weights = None # unit weights for dom/wdeg, None to break ties by static degree
+        if weighted:
+            self.weights = ConstraintWeights([cell.value for cell in self.cells])
         self.initialize_domains()
         self.initialize_neighbors()
+        self.initialize_candidate_counts()
         self.count = 0
 
     def __hash__(self):
-        return hash(str(self.matrix))
+        return self.hash
 
     def __str__(self):
         out = ""
@@ -49,105 +61,152 @@ class SudokuPuzzle:
 
     #initialize the domain of each cell inside the Sudoku puzzle
     def initialize_domains(self):
-        for row in range(9):
-            for col in range(9):
-                domain = self.row_constraints[row].intersection(self.col_constraints[col],
-                                                                self.box_constraints[row//3][col//3])
-                self.matrix[row][col].domain = domain
+        for index in CELLS:
+            self.cells[index].domain = self.row_constraints[ROW_OF[index]].intersection(
+                self.col_constraints[COL_OF[index]], self.box_constraints[BOX_OF[index]])
 
     # initialize the neighbors of each cell inside the Sudoku puzzle
     def initialize_neighbors(self):
-        for row in range(9):
-            for col in range(9):
-                self.matrix[row][col].neighbors = self.find_neighbors(row, col)
+        for index in CELLS:
+            self.cells[index].neighbors = self.find_neighbors(index)
 
-    # find all unassigned neighbor cells of the cell at coordinate (row, col)
-    def find_neighbors(self, row, col):
-        neighbors = set()
-        for i in range(9):
-            if i != row and self.matrix[i][col].value == 0:
-                neighbors.add((i, col))
-            if i != col and self.matrix[row][i].value == 0:
-                neighbors.add((row, i))
-        box_row = row // 3 * 3
-        box_col = col // 3 * 3
-        for i in range(box_row, box_row + 3):
-            for j in range(box_col, box_col + 3):
-                if i != row and j != col and self.matrix[i][j].value == 0:
-                    neighbors.add((i, j))
-        return neighbors
+    # find the indices of all unassigned neighbor cells of the cell at index
+    def find_neighbors(self, index):
+        return set(peer for peer in PEERS[index] if self.cells[peer].value == 0)
+
+    # choose the unassigned cell with the smallest domain size over weighted degree
+    # heuristics: dom/wdeg, ties broken by Most Constraining Variable
+    def choose_cell_by_weight(self):
+        min_ratio = None
+        max_degree = -1
+        chosen = None
+        for index in CELLS:
+            if self.cells[index].value == 0:
+                ratio = self.weights.ratio(len(self.cells[index].domain), index)
+                degree = len(self.cells[index].neighbors)
+                if min_ratio is None or ratio < min_ratio or (ratio == min_ratio and degree > max_degree):
+                    min_ratio = ratio
+                    max_degree = degree
+                    chosen = index
+        return chosen
 
     #choose the coordinate of the next cell to be assigned
     #heuristcs implemented: Most Constrained Variable
     def choose_cell_to_assign(self):
+        if self.weights is not None:
+            return self.choose_cell_by_weight()
         min_domain = 100
         max_degree = -1
-        chosen_row = None
-        chosen_col = None
-        for row in range(9):
-            for col in range(9):
-                if self.matrix[row][col].value == 0:
-                    domain_size = len(self.matrix[row][col].domain)
-                    if domain_size < min_domain:
-                        min_domain = domain_size
-                        chosen_row = row
-                        chosen_col = col
-                    elif domain_size == min_domain:
-                        degree = len(self.matrix[row][col].neighbors)
-                        if degree > max_degree:
-                            max_degree = degree
-                            chosen_row = row
-                            chosen_col = col
-        return (chosen_row, chosen_col)
+        chosen = None
+        for index in CELLS:
+            if self.cells[index].value == 0:
+                domain_size = len(self.cells[index].domain)
+                if domain_size < min_domain:
+                    min_domain = domain_size
+                    chosen = index
+                elif domain_size == min_domain:
+                    degree = len(self.cells[index].neighbors)
+                    if degree > max_degree:
+                        max_degree = degree
+                        chosen = index
+        return chosen
+
+    # initialize, for each unit and value, the number of unassigned cells of the unit having the value in their domain
+    def initialize_candidate_counts(self):
+        self.candidate_counts = [[0] * 10 for unit in range(27)]
+        for index in CELLS:
+            if self.cells[index].value == 0:
+                self.update_candidate_counts(index, self.cells[index].domain, 1)
+
+    # add change to the counts of the given values in every unit of the cell at index
+    def update_candidate_counts(self, index, values, change):
+        for unit in UNITS_OF[index]:
+            counts = self.candidate_counts[unit]
+            for value in values:
+                counts[value] += change
 
     #arrange the values of a cell's domain for later assignment
     #heuristics implemented: Least Constraining Value
-    def arrange_value_to_assign(self, row, col):
-        value_and_conflict_table = set()
-        for value in self.matrix[row][col].domain:
-            no_of_conflict = self.count_conflict(row, col, value)
-            value_and_conflict_table.add((value, no_of_conflict))
-        sorted(value_and_conflict_table, key=lambda x: x[1], reverse=True)
-        return value_and_conflict_table
-
-    #count the number of conflict that would be caused if a value is assigned at coordinate (row, col)
-    def count_conflict(self, row, col, value):
-        no_of_conflict = 0
-        for (i, j) in self.matrix[row][col].neighbors:
-            if value in self.matrix[i][j].domain:
-                no_of_conflict += 1
-        return no_of_conflict
+    def arrange_value_to_assign(self, index):
+        return sorted(self.cells[index].domain, key=lambda value: (self.count_conflict(index, value), value))
+
+    #count the number of conflict that would be caused if a value is assigned at index
+    #a neighbor sharing both the box and the row or collumn of the cell is counted once for each unit
+    def count_conflict(self, index, value):
+        row, col, box = UNITS_OF[index]
+        return (self.candidate_counts[row][value] + self.candidate_counts[col][value] +
+                self.candidate_counts[box][value] - 3)
+
+    # remove the assigned value from the domains of the unassigned peers of index, and remember those peers
+    def forward_check(self, index, new_value):
+        pruned = []
+        for peer in self.cells[index].neighbors:
+            if new_value in self.cells[peer].domain:
+                self.cells[peer].domain.remove(new_value)
+                pruned.append(peer)
+        self.pruned.append(pruned)
+
+    # give the assigned value back to the peers that lost it in the last forward check
+    def undo_forward_check(self, new_value):
+        for peer in self.pruned.pop():
+            self.cells[peer].domain.add(new_value)
 
     #assign a value to a cell and update domains and constraints
-    def assign(self, row, col, new_value):
-        self.matrix[row][col].value = new_value
-        self.row_constraints[row].remove(new_value)
-        self.col_constraints[col].remove(new_value)
-        self.box_constraints[row // 3][col // 3].remove(new_value)
+    def assign(self, index, new_value):
+        self.update_candidate_counts(index, self.cells[index].domain, -1)
+        for i in self.cells[index].neighbors:
+            if new_value in self.cells[i].domain:
+                self.update_candidate_counts(i, (new_value,), -1)
+
+        self.cells[index].value = new_value
+        self.hash ^= ZOBRIST[index][new_value]
+        self.row_constraints[ROW_OF[index]].remove(new_value)
+        self.col_constraints[COL_OF[index]].remove(new_value)
+        self.box_constraints[BOX_OF[index]].remove(new_value)
+
+        for i in self.cells[index].neighbors:
+            self.cells[i].neighbors.remove(index)
+
+        if self.incremental:
+            self.forward_check(index, new_value)
+        else:
+            self.initialize_domains()
+
+        if self.weights is not None:
+            self.weights.assign(index)
+            for i in self.cells[index].neighbors:
+                if len(self.cells[i].domain) == 0:
+                    self.weights.bump(i, index)
 
-        for i, j in self.matrix[row][col].neighbors:
-            self.matrix[i][j].neighbors.remove((row, col))
+    #unassign a value from a cell and update domains and constraints
+    def undo_assign(self, index, new_value):
+        self.hash ^= ZOBRIST[index][self.cells[index].value]
+        self.cells[index].value = 0
+        self.row_constraints[ROW_OF[index]].add(new_value)
+        self.col_constraints[COL_OF[index]].add(new_value)
+        self.box_constraints[BOX_OF[index]].add(new_value)
 
-        self.initialize_domains()
+        for i in self.cells[index].neighbors:
+            self.cells[i].neighbors.add(index)
 
-    #unassign a value from a cell and update domains and constraints
-    def undo_assign(self, row, col, new_value):
-        self.matrix[row][col].value = 0
-        self.row_constraints[row].add(new_value)
-        self.col_constraints[col].add(new_value)
-        self.box_constraints[row // 3][col // 3].add(new_value)
+        if self.incremental:
+            self.undo_forward_check(new_value)
+        else:
+            self.initialize_domains()
 
-        for i, j in self.matrix[row][col].neighbors:
-            self.matrix[i][j].neighbors.add((row, col))
+        if self.weights is not None:
+            self.weights.unassign(index)
 
-        self.initialize_domains()
+        self.update_candidate_counts(index, self.cells[index].domain, 1)
+        for i in self.cells[index].neighbors:
+            if new_value in self.cells[i].domain:
+                self.update_candidate_counts(i, (new_value,), 1)
 
     #check if the value assignment at coordinate (row,col) is valid
     def is_valid(self):
-        for i in range(9):
-            for j in range(9):
-                if self.matrix[i][j].value == 0 and len(self.matrix[i][j].domain) == 0:
-                    return False
+        for index in CELLS:
+            if self.cells[index].value == 0 and len(self.cells[index].domain) == 0:
+                return False
         return True
 
     def backtrack_search(self):
@@ -156,39 +215,53 @@ class SudokuPuzzle:
             return True
         if not self.is_valid():
             return False
-        (row, col) = self.choose_cell_to_assign()
-        domain_copy = self.arrange_value_to_assign(row, col)
-        for new_value, no_conflict in domain_copy:
-            self.assign(row, col, new_value)
+        index = self.choose_cell_to_assign()
+        domain_copy = self.arrange_value_to_assign(index)
+        for new_value in domain_copy:
+            self.assign(index, new_value)
             result = self.backtrack_search()
             if result is True:
                 return True
             else:
-                self.undo_assign(row, col, new_value)
+                self.undo_assign(index, new_value)
+
+    # values to try at a cell, for the iterative search driver
+    def values_to_assign(self, index):
+        return self.arrange_value_to_assign(index)
+
+    # assign a value for the iterative search driver, the value itself is enough to undo it
+    def make_choice(self, index, new_value):
+        self.assign(index, new_value)
+        return new_value, True
+
+    def retract_choice(self, index, new_value):
+        self.undo_assign(index, new_value)
 
     def is_answer(self):
-        for row in range(9):
-            for col in range(9):
-                if self.matrix[row][col].value == 0:
-                    return False
+        for index in CELLS:
+            if self.cells[index].value == 0:
+                return False
         return True
 
 class Sudoku(object):
-    def __init__(self, puzzle):
+    def __init__(self, puzzle, incremental=True, weighted=False):
         # you may add more attributes if you need
         self.puzzle = puzzle # self.puzzle is a list of lists
+        self.incremental = incremental # forward check only the peers of each assigned cell, instead of rebuilding every domain
+        self.weighted = weighted # order cells by dom/wdeg instead of domain size and static degree
         self.ans = puzzleCopy(puzzle) # self.ans is a list of lists
 
         self.matrix = self.initialize_cells(self.puzzle)
 
         self.row_constraints = [set([1, 2, 3, 4, 5, 6, 7, 8, 9]) for i in range(9)] #set of values that haven't appeared in each row
         self.col_constraints = [set([1, 2, 3, 4, 5, 6, 7, 8, 9]) for i in range(9)] #set of values that haven't appeared in each collumn
-        self.box_constraints = [[set([1, 2, 3, 4, 5, 6, 7, 8, 9]) for i in range(3)] for j in range(3)] #set of values that haven't appeared in each 3x3 box
+        self.box_constraints = [set([1, 2, 3, 4, 5, 6, 7, 8, 9]) for i in range(9)] #set of values that haven't appeared in each 3x3 box
         
         self.initialize_constraints()
 
         self.time = 0
         self.count = 0
+        self.weight_bumps = 0
 
     #initialize the value inside each cell with given input
     def initialize_cells(self,puzzle):
@@ -200,27 +273,31 @@ class Sudoku(object):
 
     #initialize the row, collumn, and 3x3 box constraints of the Sudoku puzzle
     def initialize_constraints(self):
-        for row in range(9):
-            for col in range(9):
-                value = self.matrix[row][col].value
-                if value != 0:
-                    self.row_constraints[row].remove(value)
-                    self.col_constraints[col].remove(value)
-                    self.box_constraints[row//3][col//3].remove(value)
+        for index in CELLS:
+            value = self.matrix[ROW_OF[index]][COL_OF[index]].value
+            if value != 0:
+                self.row_constraints[ROW_OF[index]].remove(value)
+                self.col_constraints[COL_OF[index]].remove(value)
+                self.box_constraints[BOX_OF[index]].remove(value)
 
     # def generate_domains
 
     def solve(self):
         # TODO: Write your code here
         start_time = time.time()
-        sudokuPuzzle = SudokuPuzzle(self.matrix, self.row_constraints, self.col_constraints, self.box_constraints)
-        sudokuPuzzle.backtrack_search()
+        sudokuPuzzle = SudokuPuzzle(self.matrix, self.row_constraints, self.col_constraints, self.box_constraints,
+                                    self.incremental, self.weighted)
+        IterativeSearch(sudokuPuzzle).run()
         end_time = time.time()
         self.time = end_time - start_time
         self.count = sudokuPuzzle.count
+        if sudokuPuzzle.weights is not None:
+            self.weight_bumps = sudokuPuzzle.weights.bumps
         print("Variant (C): Most Constrained Variable with Most Constraining Variable + Least Constraining Value + Forward Checking")
         print("Time elapsed " + str(end_time - start_time))
         print("Number of states traversed: " + str(sudokuPuzzle.count))
+        if sudokuPuzzle.weights is not None:
+            print("Constraint weight bumps: " + str(sudokuPuzzle.weights.bumps))
         return sudokuPuzzle.matrix
 
     # you may add more classes/functions if you think is useful
@@ -1,6 +1,10 @@
 import sys
 import copy
 import time
+from search import IterativeSearch
+from weights import ConstraintWeights
+from tables import CELLS, ROW_OF, COL_OF, BOX_OF, PEERS
+from zobrist import ZOBRIST, zobristHash
 
 # Running script: given code can be run with the command:
 # python file.py, ./path/to/init_state.txt ./output/output.txt
@@ -21,11 +25,16 @@ class Cell:
         return str(self.value)
 
 class SudokuPuzzle:
-    def __init__(self, matrix, row_constraints, col_constraints, box_constraints, depth):
+    def __init__(self, matrix, row_constraints, col_constraints, box_constraints, depth, weighted=False):
         self.matrix = matrix
+        self.cells = [matrix[ROW_OF[index]][COL_OF[index]] for index in CELLS] # flat view of matrix
+        self.hash = zobristHash([cell.value for cell in self.cells]) # Zobrist hash of the values, kept by assign
         self.row_constraints = row_constraints
         self.col_constraints = col_constraints
         self.box_constraints = box_constraints
+        self.weights = None # unit weights for dom/wdeg, None to break ties by static degree
+        if weighted:
+            self.weights = ConstraintWeights([cell.value for cell in self.cells])
         self.initialize_domains()
         self.initialize_neighbors()
         self.AC_3(dict())
@@ -34,7 +43,7 @@ class SudokuPuzzle:
         self.depth = depth
 
     def __hash__(self):
-        return hash(str(self.matrix))
+        return self.hash
 
     def __str__(self):
         out = ""
@@ -46,148 +55,152 @@ class SudokuPuzzle:
 
     #initialize the domain of each cell inside the Sudoku puzzle
     def initialize_domains(self):
-        for row in range(9):
-            for col in range(9):
-                domain = self.row_constraints[row].intersection(self.col_constraints[col],
-                                                                self.box_constraints[row//3][col//3])
-                self.matrix[row][col].domain = domain
+        for index in CELLS:
+            self.cells[index].domain = self.row_constraints[ROW_OF[index]].intersection(
+                self.col_constraints[COL_OF[index]], self.box_constraints[BOX_OF[index]])
 
     # initialize the neighbors of each cell inside the Sudoku puzzle
     def initialize_neighbors(self):
-        for row in range(9):
-            for col in range(9):
-                self.matrix[row][col].neighbors = self.find_neighbors(row, col)
+        for index in CELLS:
+            self.cells[index].neighbors = self.find_neighbors(index)
 
-    # find all unassigned neighbor cells of the cell at coordinate (row, col)
-    def find_neighbors(self, row, col):
-        neighbors = set()
-        for i in range(9):
-            if i != row and self.matrix[i][col].value == 0:
-                neighbors.add((i, col))
-            if i != col and self.matrix[row][i].value == 0:
-                neighbors.add((row, i))
-        box_row = row // 3 * 3
-        box_col = col // 3 * 3
-        for i in range(box_row, box_row + 3):
-            for j in range(box_col, box_col + 3):
-                if i != row and j != col and self.matrix[i][j].value == 0:
-                    neighbors.add((i, j))
-        return neighbors
+    # find the indices of all unassigned neighbor cells of the cell at index
+    def find_neighbors(self, index):
+        return set(peer for peer in PEERS[index] if self.cells[peer].value == 0)
+
+    # choose the unassigned cell with the smallest domain size over weighted degree
+    # heuristics: dom/wdeg, ties broken by Most Constraining Variable
+    def choose_cell_by_weight(self):
+        min_ratio = None
+        max_degree = -1
+        chosen = None
+        for index in CELLS:
+            if self.cells[index].value == 0:
+                ratio = self.weights.ratio(len(self.cells[index].domain), index)
+                degree = len(self.cells[index].neighbors)
+                if min_ratio is None or ratio < min_ratio or (ratio == min_ratio and degree > max_degree):
+                    min_ratio = ratio
+                    max_degree = degree
+                    chosen = index
+        return chosen
 
     # choose the coordinate of the next cell to be assigned
     # heuristics: Most Constrained Variable and Most Constraining Variable
     def choose_cell_to_assign(self):
+        if self.weights is not None:
+            return self.choose_cell_by_weight()
         min_domain = 100
         max_degree = -1
-        chosen_row = None
-        chosen_col = None
-        for row in range(9):
-            for col in range(9):
-                if self.matrix[row][col].value == 0:
-                    domain_size = len(self.matrix[row][col].domain)
-                    if domain_size < min_domain:
-                        min_domain = domain_size
-                        chosen_row = row
-                        chosen_col = col
-                    elif domain_size == min_domain:
-                        degree = len(self.matrix[row][col].neighbors)
-                        if degree > max_degree:
-                            max_degree = degree
-                            chosen_row = row
-                            chosen_col = col
-        return (chosen_row, chosen_col)
+        chosen = None
+        for index in CELLS:
+            if self.cells[index].value == 0:
+                domain_size = len(self.cells[index].domain)
+                if domain_size < min_domain:
+                    min_domain = domain_size
+                    chosen = index
+                elif domain_size == min_domain:
+                    degree = len(self.cells[index].neighbors)
+                    if degree > max_degree:
+                        max_degree = degree
+                        chosen = index
+        return chosen
 
     # assign a value to a cell, update domains and neighbors set, and record domain changes
-    def assign(self, row, col, new_value, domain_changes):
+    def assign(self, index, new_value, domain_changes):
         self.no_of_assignment += 1
         self.depth += 1
-        self.matrix[row][col].value = new_value
-
-        # update domains and neighbor set for the neighbor cells of (row, col)
-        for i, j in self.matrix[row][col].neighbors:
-            self.matrix[i][j].neighbors.remove((row, col))
-            if new_value in self.matrix[i][j].domain and self.matrix[i][j].value == 0:
-                self.matrix[i][j].domain.remove(new_value)
-                if domain_changes.has_key((i, j)):
-                    domain_changes[(i, j)].add(new_value)
+        self.cells[index].value = new_value
+        self.hash ^= ZOBRIST[index][new_value]
+        if self.weights is not None:
+            self.weights.assign(index)
+
+        # update domains and neighbor set for the neighbor cells of index
+        for i in self.cells[index].neighbors:
+            self.cells[i].neighbors.remove(index)
+            if new_value in self.cells[i].domain and self.cells[i].value == 0:
+                self.cells[i].domain.remove(new_value)
+                if domain_changes.has_key(i):
+                    domain_changes[i].add(new_value)
                 else:
-                    domain_changes[(i, j)] = set([new_value])
+                    domain_changes[i] = set([new_value])
+                if self.weights is not None and len(self.cells[i].domain) == 0:
+                    self.weights.bump(i, index)
 
         # only runs AC_3 at after every 20 assignments
         if self.no_of_assignment % 20 == 0:
             self.AC_3(domain_changes)
 
     # unassign a value from a cell and revert changes to domains and neighbors set
-    def undo_assign(self, row, col, domain_changes):
+    def undo_assign(self, index, domain_changes):
         self.no_of_assignment -= 1
         self.depth -= 1
-        self.matrix[row][col].value = 0
-        for i, j in self.matrix[row][col].neighbors:
-            self.matrix[i][j].neighbors.add((row, col))
+        self.hash ^= ZOBRIST[index][self.cells[index].value]
+        self.cells[index].value = 0
+        if self.weights is not None:
+            self.weights.unassign(index)
+        for i in self.cells[index].neighbors:
+            self.cells[i].neighbors.add(index)
         self.undo_domain_changes(domain_changes)
 
     # check if the current sudoku state is solvable
     def is_valid(self):
-        for i in range(9):
-            for j in range(9):
-                if self.matrix[i][j].value == 0 and len(self.matrix[i][j].domain) == 0:
-                    return False
+        for index in CELLS:
+            if self.cells[index].value == 0 and len(self.cells[index].domain) == 0:
+                return False
         return True
 
     # Initialize every arc among unassigned cells
     def intitializeAC3_queue(self):
         queue = list()
-        for row in range(9):
-            for col in range(9):
-                if self.matrix[row][col].value != 0:
-                    continue
-                for neighbor_row, neighbor_col in self.matrix[row][col].neighbors:
-                    if len(self.matrix[neighbor_row][neighbor_col].domain) == 1 and self.matrix[row][col].value == 0:
-                        queue.append(((row, col), (neighbor_row, neighbor_col)))
+        for index in CELLS:
+            if self.cells[index].value != 0:
+                continue
+            for neighbor in self.cells[index].neighbors:
+                if len(self.cells[neighbor].domain) == 1:
+                    queue.append((index, neighbor))
         return queue
 
-    # Revise the domains of two cells with the arc between (row, col) and (neighbor_row, neighbor_col)
-    # Pre-condition: domain of (neighbor_row, neighbor_col) has only 1 value
-    def revise(self, row, col, neighbor_row, neighbor_col, domain_changes):
-        domain1 = self.matrix[row][col].domain
-        domain2 = self.matrix[neighbor_row][neighbor_col].domain
+    # Revise the domains of two cells with the arc between index and neighbor
+    # Pre-condition: domain of neighbor has only 1 value
+    def revise(self, index, neighbor, domain_changes):
+        domain1 = self.cells[index].domain
+        domain2 = self.cells[neighbor].domain
         revise = False
         if len(domain2) != 1:
             return False
         for value in domain2:
             if value in domain1:
                 domain1.remove(value)
-                if domain_changes.has_key((row, col)):
-                    domain_changes[(row, col)].add(value)
+                if domain_changes.has_key(index):
+                    domain_changes[index].add(value)
                 else:
-                    domain_changes[(row, col)] = set([value])
+                    domain_changes[index] = set([value])
                 revise = True
         return revise
 
     # Update the queue with more arcs
-    def update_queue(self, queue, row, col, neighbor_row, neighbor_col):
-        for (i, j) in self.matrix[row][col].neighbors:
-            if (i, j) != (row, col) \
-                    and (i, j) != (neighbor_row, neighbor_col) \
-                    and self.matrix[i][j].value == 0:
-                queue.append(((i, j), (row, col)))
+    def update_queue(self, queue, index, neighbor):
+        for i in self.cells[index].neighbors:
+            if i != index and i != neighbor and self.cells[i].value == 0:
+                queue.append((i, index))
 
     def AC_3(self, domain_changes):
         queue = self.intitializeAC3_queue()
         while queue:
-            (row, col), (neighbor_row, neighbor_col) = queue.pop(0)
-            if self.revise(row, col, neighbor_row, neighbor_col, domain_changes):
-                if len(self.matrix[row][col].domain) == 0:
+            index, neighbor = queue.pop(0)
+            if self.revise(index, neighbor, domain_changes):
+                if len(self.cells[index].domain) == 0:
+                    if self.weights is not None:
+                        self.weights.bump(index, neighbor)
                     return False
-                if len(self.matrix[row][col].domain) == 1:
-                    self.update_queue(queue, row, col, neighbor_row, neighbor_col)
-            # print(str(row) + " " + str(col) + " " + str(neighbor_row) + " " + str(neighbor_col))
+                if len(self.cells[index].domain) == 1:
+                    self.update_queue(queue, index, neighbor)
         return True
 
     def undo_domain_changes(self, domain_changes):
-        for (row, col), changes in domain_changes.items():
+        for index, changes in domain_changes.items():
             while changes:
-                self.matrix[row][col].domain.add(changes.pop())
+                self.cells[index].domain.add(changes.pop())
 
     def backtrack_search(self):
         self.count += 1
@@ -195,28 +208,41 @@ class SudokuPuzzle:
             return True
         if not self.is_valid():
             return False
-        (row, col) = self.choose_cell_to_assign()
-        domain_copy = self.matrix[row][col].domain.copy()
+        index = self.choose_cell_to_assign()
+        domain_copy = self.cells[index].domain.copy()
         for new_value in domain_copy:
             domain_changes = dict()
-            self.assign(row, col, new_value, domain_changes)
+            self.assign(index, new_value, domain_changes)
             result = self.backtrack_search()
             if result is True:
                 return True
             else:
-                self.undo_assign(row, col, domain_changes)
+                self.undo_assign(index, domain_changes)
+
+    # values to try at a cell, for the iterative search driver
+    def values_to_assign(self, index):
+        return self.cells[index].domain.copy()
+
+    # assign a value for the iterative search driver, undone through the domain changes it made
+    def make_choice(self, index, new_value):
+        domain_changes = dict()
+        self.assign(index, new_value, domain_changes)
+        return domain_changes, True
+
+    def retract_choice(self, index, domain_changes):
+        self.undo_assign(index, domain_changes)
 
     def is_answer(self):
-        for row in range(9):
-            for col in range(9):
-                if self.matrix[row][col].value == 0:
-                    return False
+        for index in CELLS:
+            if self.cells[index].value == 0:
+                return False
         return True
 
 class Sudoku(object):
-    def __init__(self, puzzle):
+    def __init__(self, puzzle, weighted=False):
         # you may add more attributes if you need
         self.puzzle = puzzle  # self.puzzle is a list of lists
+        self.weighted = weighted # order cells by dom/wdeg instead of domain size and static degree
         self.ans = puzzleCopy(puzzle)  # self.ans is a list of lists
 
         self.depth = 0 # depth represent the number of cells that have been assigned value
@@ -227,13 +253,13 @@ class Sudoku(object):
                                 range(9)]  # set of values that haven't appeared in each row
         self.col_constraints = [set([1, 2, 3, 4, 5, 6, 7, 8, 9]) for i in
                                 range(9)]  # set of values that haven't appeared in each collumn
-        self.box_constraints = [[set([1, 2, 3, 4, 5, 6, 7, 8, 9]) for i in range(3)] for j in
-                                range(3)]  # set of values that haven't appeared in each 3x3 box
+        self.box_constraints = [set([1, 2, 3, 4, 5, 6, 7, 8, 9]) for i in range(9)]  # set of values that haven't appeared in each 3x3 box
 
         self.initialize_constraints()
 
         self.time = 0
         self.count = 0
+        self.weight_bumps = 0
 
     # initialize the value inside each cell with given input
     def initialize_cells(self, puzzle):
@@ -245,26 +271,30 @@ class Sudoku(object):
 
     # initialize the row, collumn, and 3x3 box constraints of the Sudoku puzzle
     def initialize_constraints(self):
-        for row in range(9):
-            for col in range(9):
-                value = self.matrix[row][col].value
-                if value != 0:
-                    self.depth += 1
-                    self.row_constraints[row].remove(value)
-                    self.col_constraints[col].remove(value)
-                    self.box_constraints[row // 3][col // 3].remove(value)
+        for index in CELLS:
+            value = self.matrix[ROW_OF[index]][COL_OF[index]].value
+            if value != 0:
+                self.depth += 1
+                self.row_constraints[ROW_OF[index]].remove(value)
+                self.col_constraints[COL_OF[index]].remove(value)
+                self.box_constraints[BOX_OF[index]].remove(value)
 
     def solve(self):
         # TODO: Write your code here
         start_time = time.time()
-        sudokuPuzzle = SudokuPuzzle(self.matrix, self.row_constraints, self.col_constraints, self.box_constraints, self.depth)
-        sudokuPuzzle.backtrack_search()
+        sudokuPuzzle = SudokuPuzzle(self.matrix, self.row_constraints, self.col_constraints, self.box_constraints, self.depth,
+                                    self.weighted)
+        IterativeSearch(sudokuPuzzle).run()
         end_time = time.time()
         self.time = end_time - start_time
         self.count = sudokuPuzzle.count
+        if sudokuPuzzle.weights is not None:
+            self.weight_bumps = sudokuPuzzle.weights.bumps
         print("Variant (E): Most Constrained Variable with Most Constraining Variable + modified AC-3")
         print("Time elapsed " + str(end_time - start_time))
         print("Number of states traversed: " + str(sudokuPuzzle.count))
+        if sudokuPuzzle.weights is not None:
+            print("Constraint weight bumps: " + str(sudokuPuzzle.weights.bumps))
         return sudokuPuzzle.matrix
 
     # you may add more classes/functions if you think is useful
@@ -1,6 +1,7 @@
 import os
 import sys
 import csv
+import random
 from random import shuffle
 from random import randint
 import A as algoA
@@ -8,6 +9,10 @@ import B as algoB
 import C as algoC
 import D as algoD
 import E as algoE
+import F as algoF
+import G as algoG
+import H as algoH
+import I as algoI
 
 def filePath(path):
     fileList = []
@@ -18,8 +23,12 @@ def filePath(path):
     return fileList
 
 
-def getInputFiles():
+# the test cases of a board size: the easy, moderate and difficult tiers for 9x9 boards, and the testcases/NxN
+# folder for larger ones
+def getInputFiles(size=9):
     dir_path = os.path.dirname(os.path.realpath('__file__'))
+    if size != 9:
+        return filePath(dir_path + "/testcases/" + str(size) + "x" + str(size))
     fileList = []
     path = "/testcases/easy"
     fileList.extend(filePath(dir_path + path))
@@ -65,40 +74,151 @@ def runTests():
         e.solve()
         sublist.extend([e.time, e.count])
 
+        f = algoF.Sudoku(puzzle)
+        f.solve()
+        sublist.extend([f.time, f.count])
+
+        g = algoG.Sudoku(puzzle)
+        g.solve()
+        sublist.extend([g.time, g.count])
+
+        h = algoH.Sudoku(puzzle)
+        h.solve()
+        sublist.extend([h.time, h.count])
+
+        i = algoI.Sudoku(puzzle)
+        i.solve()
+        sublist.extend([i.time, i.count])
+
+        listoflists.append(sublist)
+        no_test_case += 1
+    return listoflists
+
+# runs variant F, the only one that solves boards larger than 9x9, on the test cases of a board size
+def runSizeTests(size):
+    listoflists = []
+    no_test_case = 1
+    for file_name in getInputFiles(size):
+        puzzle = extract_puzzle(file_name, size)
+        f = algoF.Sudoku(puzzle, size=size)
+        f.solve()
+        listoflists.append([no_test_case, str(size) + "x" + str(size), f.time, f.count])
+        no_test_case += 1
+    return listoflists
+
+# runs variant F with every branching mode on the test cases of a board size, giving the time and number of
+# states of each mode on every test case, then their totals over each tier
+def runBranchingTests(size=9):
+    listoflists = []
+    totals = {}
+    tiers = []
+    no_test_case = 1
+    for file_name in getInputFiles(size):
+        if size != 9:
+            tier = str(size) + "x" + str(size)
+        else:
+            tier = ["easy", "moderate", "hard"][min((no_test_case - 1) // 5, 2)]
+        if tier not in totals:
+            totals[tier] = [0.0, 0] * len(algoF.BRANCHING_MODES)
+            tiers.append(tier)
+        puzzle = extract_puzzle(file_name, size)
+        sublist = [no_test_case, tier]
+        for mode in algoF.BRANCHING_MODES:
+            f = algoF.Sudoku(puzzle, size=size, branching=mode)
+            f.solve()
+            sublist.extend([f.time, f.count])
+        for k in range(len(totals[tier])):
+            totals[tier][k] += sublist[2 + k]
         listoflists.append(sublist)
         no_test_case += 1
+    for tier in tiers:
+        listoflists.append(["total", tier] + totals[tier])
     return listoflists
 
-def extract_puzzle(file_name):
+# read a puzzle of the given size: 9x9 puzzles are read digit by digit, larger ones as numbers separated by
+# whitespace, 0 for an empty cell
+def extract_puzzle(file_name, size=9):
     try:
         f = open(file_name, 'r')
     except IOError:
         raise IOError("Input file not found!")
 
-    puzzle = [[0 for i in range(9)] for j in range(9)]
+    puzzle = [[0 for i in range(size)] for j in range(size)]
     lines = f.readlines()
 
-    i, j = 0, 0
-    for line in lines:
-        for number in line:
-            if '0' <= number <= '9':
-                puzzle[i][j] = int(number)
-                j += 1
-                if j == 9:
-                    i += 1
-                    j = 0
+    if size <= 9:
+        numbers = [int(number) for line in lines for number in line if '0' <= number <= '9']
+    else:
+        numbers = [int(number) for line in lines for number in line.split()]
+    if len(numbers) < size * size:
+        raise ValueError("Expected " + str(size * size) + " cells, found " + str(len(numbers)))
+
+    for i in range(size):
+        for j in range(size):
+            puzzle[i][j] = numbers[i * size + j]
     return puzzle
 
+# a random puzzle of the given size with a fraction of its cells left empty: a filled board from the base
+# pattern, with its digits, the rows inside each band, the bands, the collumns inside each stack and the
+# stacks shuffled, which keeps every row, collumn and box valid
+def generate_puzzle(size, empty_fraction, seed=None):
+    generator = random.Random(seed)
+    box_size = int(round(size ** 0.5))
+    def shuffled(items):
+        items = list(items)
+        generator.shuffle(items)
+        return items
+    bands = shuffled(range(box_size))
+    rows = [band * box_size + row for band in bands for row in shuffled(range(box_size))]
+    stacks = shuffled(range(box_size))
+    cols = [stack * box_size + col for stack in stacks for col in shuffled(range(box_size))]
+    digits = shuffled(range(1, size + 1))
+    puzzle = [[digits[(box_size * (row % box_size) + row // box_size + col) % size] for col in cols] for row in rows]
+    for cell in generator.sample(range(size * size), int(empty_fraction * size * size)):
+        puzzle[cell // size][cell % size] = 0
+    return puzzle
+
+# write a puzzle in the format read by extract_puzzle
+def write_puzzle(puzzle, file_name):
+    width = len(str(len(puzzle))) if len(puzzle) > 9 else 0
+    with open(file_name, 'w') as f:
+        for row in puzzle:
+            f.write(" ".join(str(value).rjust(width) for value in row) + "\n")
+
 
+# Running script: python Experiment.py [board size], 9 by default
+#                 python Experiment.py branching [board size], to compare the branching modes of variant F
 if __name__ == "__main__":
-     data_lists = runTests()
      dir_path = os.path.dirname(os.path.realpath('__file__'))
+     if len(sys.argv) > 1 and sys.argv[1] == "branching":
+        size = int(sys.argv[2]) if len(sys.argv) > 2 else 9
+        name = "/data_branching.csv" if size == 9 else "/data_branching_" + str(size) + "x" + str(size) + ".csv"
+        with open(dir_path + name, 'wb') as f:
+            w = csv.writer(f)
+            header = ['Test case', 'Tier']
+            for mode in algoF.BRANCHING_MODES:
+                header.extend(['Time (' + mode + ')', 'Space (' + mode + ')'])
+            w.writerow(header)
+            w.writerows(runBranchingTests(size))
+        sys.exit(0)
+     size = int(sys.argv[1]) if len(sys.argv) > 1 else 9
+     if size != 9:
+        with open(dir_path + "/data_" + str(size) + "x" + str(size) + ".csv", 'wb') as f:
+            w = csv.writer(f)
+            w.writerow(['Test case', 'Board', 'Time (F)', 'Space (F)'])
+            w.writerows(runSizeTests(size))
+        sys.exit(0)
+     data_lists = runTests()
      with open(dir_path + "/data.csv",'wb') as f: 
         w = csv.writer(f)
-        w.writerow(['Test case','Difficulty Level'
+        w.writerow(['Test case','Difficulty Level',
                     'Time (A)', 'Space (A)',
                     'Time (B)', 'Space (B)',
                     'Time (C)', 'Space (C)',
                     'Time (D)', 'Space (D)',
-                    'Time (E)', 'Space (E)'])
+                    'Time (E)', 'Space (E)',
+                    'Time (F)', 'Space (F)',
+                    'Time (G)', 'Space (G)',
+                    'Time (H)', 'Space (H)',
+                    'Time (I)', 'Space (I)'])
         w.writerows(data_lists)
\ No newline at end of file
@@ -0,0 +1,698 @@
+import sys
+import time
+import random
+from collections import deque
+from propagators import makePropagators, count_cells, cells_of
+from search import IterativeSearch, RestartingSearch, NogoodStore, RESTARTS
+from zobrist import boardKeys, zobristHash, TranspositionTable
+from tables import getBoard
+
+# Running script: given code can be run with the command:
+# python file.py, ./path/to/init_state.txt ./output/output.txt
+
+# Variant (F): Most Constrained Variable with Most Constraining Variable + modified AC-3 on bitmask domains
+#
+# Same search as version 8 / variant (E), but every cell is addressed by a flat index (row * N + col) and
+# every domain is an N-bit integer where bit (v - 1) is set if value v is still possible. N is 9 for the
+# standard board, and 16, 25 or 36 for the larger ones; every table comes from the Board of that size.
+#
+# Removed values are pushed onto a preallocated trail of (cell, removed mask) entries. Each search level
+# remembers the trail length before its assignment, and undoing the assignment pops the trail back to it.
+#
+# Unassigned cells are kept in MRV buckets indexed by domain size. Each bucket is an N*N-bit set of cells,
+# and every change to a domain moves the cell between buckets, so choosing the next cell only looks at the
+# cells of the smallest non-empty bucket instead of scanning the whole board. Bucket 0 holds the cells whose
+# domain was wiped out, so a contradiction is known as soon as a removal empties a domain, and assign
+# reports it straight away instead of letting the search expand a dead node.
+#
+# Next to the domains, every cell change is mirrored in a value-centric view: for each of the 3N units and
+# each value, the N*N-bit set of cells of that unit whose domain still holds the value. The domain of an
+# assigned cell is reduced to its value on the trail, so a value placed in a unit keeps exactly one place.
+#
+# AC-3 keeps a deque of cells whose domain has a single value left, and a deque of units with the values
+# whose places changed. Popping a cell revises the arcs from each of its unassigned peers to it; popping a
+# unit reduces a value with a single place to a hidden single, and fails if a value has no place left.
+# In-queue flags make sure a cell or unit already waiting in its queue is never appended a second time.
+#
+# AC-3 is incremental: the trail length is recorded every time it reaches a fixpoint, and the next call only
+# seeds the worklists with the cells changed on the trail since then. Undoing past a fixpoint drops it.
+#
+# Once both worklists are empty, the enabled logical techniques from propagators.py (naked and hidden
+# subsets, pointing and claiming, matching-based all-different) run in increasing order of cost. As soon as
+# one of them removes a value, AC-3 picks its removals up from the trail, and the techniques start again from
+# the cheapest one.
+#
+# Whether AC-3 runs after an assignment is decided by a propagation policy: always, every k assignments
+# (the rule used by version 8), or adaptive, which compares the recent yield of propagation with its cost.
+#
+# With restarts (see search.py), ties between cells are broken at random from a seed, so every run takes
+# another path, and the nogoods learnt at each restart forbid values as soon as their other assignments hold.
+# A transposition table of failed states, keyed by the Zobrist hash of the values, can be shared by every run.
+#
+# The search branches in one of three ways:
+#   d-way: one branch for every value of the chosen cell
+#   binary: the lowest value v of the chosen cell, then x != v, which removes v and propagates before the
+#           search chooses a cell again
+#   unit-digit: when a value has fewer places left in some unit than the smallest domain, one branch for
+#               every place of that value, otherwise d-way on the chosen cell
+
+# counters copied from the SudokuPuzzle to the Sudoku object after solving
+COUNTERS = ['count', 'max_trail_length', 'cells_enqueued', 'arcs_revised', 'duplicates_avoided',
+            'units_revised', 'hidden_singles', 'propagations', 'values_pruned', 'wipeouts',
+            'nogood_eliminations', 'refutations', 'unit_branches']
+
+BRANCHING_MODES = ["d-way", "binary", "unit-digit"]
+
+# logical techniques run by default at every AC-3 fixpoint, see propagators.py
+DEFAULT_PROPAGATORS = []
+
+# an assignment revises about one arc per peer, so this many revised arcs cost about as much as a node
+ARCS_PER_NODE = 20.0
+
+# a propagation that wipes out a domain saves the node and up to 9 children
+WIPEOUT_GAIN = 10.0
+
+def puzzleCopy(puzzle):
+    puzzle_copy = [[puzzle[i][j] for j in range(len(puzzle))] for i in range(len(puzzle))]
+    return puzzle_copy
+
+# propagate after every assignment
+class AlwaysPolicy:
+    name = "always"
+
+    def should_propagate(self, puzzle):
+        return True
+
+    def record(self, removed, revised, wipeout):
+        pass
+
+# propagate after every k-th assignment, and before the last cell is assigned
+class EveryKPolicy:
+    def __init__(self, k=20):
+        self.k = k
+        self.name = "every-" + str(k)
+
+    def should_propagate(self, puzzle):
+        return puzzle.no_of_assignment % self.k == 0 or puzzle.depth == puzzle.board.cell_count - 1
+
+    def record(self, removed, revised, wipeout):
+        pass
+
+# propagate while recent propagations prune more than they cost, measured in nodes
+# the gain of a propagation is the number of values it removes (each one is a child node that will never
+# be expanded), plus WIPEOUT_GAIN if it proves the node dead, and its cost is arcs revised / ARCS_PER_NODE
+# both are kept as exponential moving averages; while skipping, a propagation is still forced every
+# max_interval assignments so that the averages keep following the search
+class AdaptivePolicy:
+    name = "adaptive"
+
+    def __init__(self, decay=0.8, max_interval=20):
+        self.decay = decay
+        self.max_interval = max_interval
+        self.average_gain = 1.0
+        self.average_cost = 0.0
+        self.skipped = 0
+
+    def should_propagate(self, puzzle):
+        if self.average_gain >= self.average_cost or self.skipped >= self.max_interval:
+            self.skipped = 0
+            return True
+        self.skipped += 1
+        return False
+
+    def record(self, removed, revised, wipeout):
+        gain = removed + (WIPEOUT_GAIN if wipeout else 0)
+        self.average_gain = self.decay * self.average_gain + (1 - self.decay) * gain
+        self.average_cost = self.decay * self.average_cost + (1 - self.decay) * revised / ARCS_PER_NODE
+
+POLICIES = {"always": AlwaysPolicy, "every-k": EveryKPolicy, "adaptive": AdaptivePolicy}
+
+class SudokuPuzzle:
+    def __init__(self, values, row_constraints, col_constraints, box_constraints, depth, policy, propagators,
+                 seed=None, board=None, branching="d-way"):
+        self.board = board if board is not None else getBoard(9) # tables of the board size
+        cell_count = self.board.cell_count
+        size = self.board.size
+        self.size = size
+        # tables used on every domain change, kept on the puzzle to save a lookup
+        self.popcount = self.board.popcount
+        self.cell_bit = self.board.cell_bit
+        self.mask_values = self.board.mask_values
+        self.units_of = self.board.units_of
+        self.values = values # flat list of cell values, 0 if unassigned
+        self.keys = boardKeys(self.board) # Zobrist keys of the board size
+        self.hash = zobristHash(values, self.keys) # Zobrist hash of the values, kept by assign and undo_assign
+        self.domains = [0] * cell_count # flat list of domain masks
+        self.degrees = [0] * cell_count # number of unassigned peers of each cell
+        # every entry removes at least one value from a domain, so one search path never needs more entries
+        self.trail_cells = [0] * (cell_count * size) # cell of each trail entry
+        self.trail_masks = [0] * (cell_count * size) # values removed from that cell by each trail entry
+        self.trail_length = 0
+        self.max_trail_length = 0
+        self.buckets = [0] * (size + 1) # unassigned cells by domain size
+        self.places = [0] * (self.board.unit_count * size) # cells of each unit whose domain holds each value, at unit * N + value - 1
+        self.queue = deque() # AC-3 worklist of singleton cells, empty between calls
+        self.in_queue = [False] * cell_count # whether each cell is waiting in the worklist
+        self.unit_queue = deque() # AC-3 worklist of units, empty between calls
+        self.unit_changes = [0] * self.board.unit_count # values whose places changed in each unit waiting in the worklist
+        self.cells_enqueued = 0
+        self.arcs_revised = 0
+        self.duplicates_avoided = 0
+        self.units_revised = 0
+        self.hidden_singles = 0
+        self.propagators = propagators # logical techniques run at every AC-3 fixpoint, ordered by cost
+        self.policy = policy # decides after which assignments AC-3 runs
+        self.propagations = 0 # number of AC-3 runs chosen by the policy
+        self.values_pruned = 0 # values removed by those runs
+        self.wipeouts = 0 # those runs that proved the node dead
+        self.random = random.Random(seed) if seed is not None else None # breaks ties between cells if set
+        self.nogoods = None # nogoods learnt at restarts
+        self.nogood_eliminations = 0 # values removed by nogoods
+        self.branching = branching # one of BRANCHING_MODES
+        self.refutations = 0 # x != v branches taken by binary branching
+        self.unit_branches = 0 # choice points on the places of a value in a unit
+        self.row_constraints = row_constraints
+        self.col_constraints = col_constraints
+        self.box_constraints = box_constraints
+        self.initialize_domains()
+        self.initialize_degrees()
+        self.initialize_buckets()
+        self.initialize_places()
+        self.fixpoints = [0] # trail lengths at which AC-3 reached a fixpoint on the current search path
+        self.initialize_AC3_queue()
+        self.consistent = self.AC_3() # False if propagation at the root already proved there is no answer
+        self.trail_length = 0 # the initial state is never undone
+        self.fixpoints = [0]
+        self.max_trail_length = 0
+        self.count = 0
+        self.no_of_assignment = 0
+        self.depth = depth
+
+    def __hash__(self):
+        return self.hash
+
+    def __str__(self):
+        size = self.board.size
+        out = ""
+        for row in range(size):
+            for col in range(size):
+                out = out + " " + str(self.values[row * size + col])
+            out = out + "\n"
+        return out
+
+    # initialize the domain mask of each cell inside the Sudoku puzzle, which is its value if it is given
+    def initialize_domains(self):
+        board = self.board
+        for index in board.cells:
+            if self.values[index] != 0:
+                self.domains[index] = board.value_to_bit[self.values[index]]
+            else:
+                self.domains[index] = self.row_constraints[board.row_of[index]] \
+                                      & self.col_constraints[board.col_of[index]] & self.box_constraints[board.box_of[index]]
+
+    # initialize the places of each value inside each unit
+    def initialize_places(self):
+        for index in self.board.cells:
+            self.toggle_places(index, self.domains[index])
+
+    # add a cell to the places of the values in mask inside its units, or remove it if it is already there
+    def toggle_places(self, index, mask):
+        bit = self.cell_bit[index]
+        size = self.size
+        units = self.units_of[index]
+        for value in self.mask_values[mask]:
+            for unit in units:
+                self.places[unit * size + value - 1] ^= bit
+
+    # initialize the number of unassigned peers of each cell
+    def initialize_degrees(self):
+        for index in self.board.cells:
+            degree = 0
+            for peer in self.board.peers[index]:
+                if self.values[peer] == 0:
+                    degree += 1
+            self.degrees[index] = degree
+
+    # put every unassigned cell into the bucket of its domain size and degree
+    def initialize_buckets(self):
+        for index in self.board.cells:
+            if self.values[index] == 0:
+                self.toggle_bucket(index)
+
+    # add a cell to the bucket of its current domain size, or remove it if it is already there
+    def toggle_bucket(self, index):
+        self.buckets[self.popcount[self.domains[index]]] ^= self.cell_bit[index]
+
+    # choose the index of the next cell to be assigned, or a (unit, value) pair to branch on its places
+    # heuristics: Most Constrained Variable, then Most Constraining Variable, then lowest index or at random
+    def choose_cell_to_assign(self):
+        for domain_size, cells in enumerate(self.buckets):
+            if cells:
+                if self.branching == "unit-digit" and domain_size > 1:
+                    choice = self.choose_unit_digit(domain_size)
+                    if choice is not None:
+                        self.unit_branches += 1
+                        return choice
+                max_degree = -1
+                chosen = None
+                ties = 0
+                while cells:
+                    bit = cells & -cells
+                    cells ^= bit
+                    index = bit.bit_length() - 1
+                    if self.degrees[index] > max_degree:
+                        max_degree = self.degrees[index]
+                        chosen = index
+                        ties = 1
+                    elif self.degrees[index] == max_degree and self.random is not None:
+                        ties += 1
+                        if self.random.randrange(ties) == 0:
+                            chosen = index
+                return chosen
+        return None
+
+    # the (unit, value) pair whose value has the fewest places left inside the unit, if fewer than
+    # smallest_domain, else None; a value with a single place is only chosen if that cell is unassigned
+    def choose_unit_digit(self, smallest_domain):
+        size = self.size
+        chosen = None
+        fewest = smallest_domain
+        for unit in range(self.board.unit_count):
+            for value in self.board.values:
+                cells = self.places[unit * size + value - 1]
+                if cells == 0 or (cells & (cells - 1) == 0 and self.values[cells.bit_length() - 1] != 0):
+                    continue
+                count = count_cells(cells)
+                if count < fewest:
+                    fewest = count
+                    chosen = (unit, value)
+        return chosen
+
+    # remove the values in mask from the domain of a cell and record the change on the trail
+    def remove_values(self, index, mask):
+        domain = self.domains[index]
+        if self.values[index] == 0:
+            self.buckets[self.popcount[domain]] ^= self.cell_bit[index]
+            self.buckets[self.popcount[domain & ~mask]] ^= self.cell_bit[index]
+        self.domains[index] = domain & ~mask
+        self.toggle_places(index, mask)
+        self.trail_cells[self.trail_length] = index
+        self.trail_masks[self.trail_length] = mask
+        self.trail_length += 1
+        if self.trail_length > self.max_trail_length:
+            self.max_trail_length = self.trail_length
+
+    # restore every domain change recorded on the trail after mark
+    def undo_to_mark(self, mark):
+        while self.fixpoints[-1] > mark:
+            self.fixpoints.pop()
+        while self.trail_length > mark:
+            self.trail_length -= 1
+            index = self.trail_cells[self.trail_length]
+            mask = self.trail_masks[self.trail_length]
+            domain = self.domains[index]
+            if self.values[index] == 0:
+                self.buckets[self.popcount[domain]] ^= self.cell_bit[index]
+                self.buckets[self.popcount[domain | mask]] ^= self.cell_bit[index]
+            self.domains[index] = domain | mask
+            self.toggle_places(index, mask)
+
+    # assign a value to a cell, update domains and degrees, and record domain changes on the trail
+    # returns False if the assignment wipes out the domain of an unassigned cell
+    def assign(self, index, new_value):
+        self.no_of_assignment += 1
+        self.depth += 1
+        self.toggle_bucket(index)
+        self.values[index] = new_value
+        self.hash ^= self.keys[index][new_value]
+        bit = self.board.value_to_bit[new_value]
+        if self.domains[index] != bit:
+            self.remove_values(index, self.domains[index] & ~bit)
+
+        # update domains and degrees for the unassigned peers of index
+        for peer in self.board.peers[index]:
+            if self.values[peer] == 0:
+                self.degrees[peer] -= 1
+                if self.domains[peer] & bit:
+                    self.remove_values(peer, bit)
+        if self.nogoods is not None and not self.apply_nogoods(index, new_value):
+            return False
+        if not self.is_valid():
+            return False
+
+        if self.policy.should_propagate(self):
+            return self.propagate()
+        return True
+
+    # remove the values forbidden by the nogoods once value is assigned at index
+    # returns False if a nogood has all of its assignments made
+    def apply_nogoods(self, index, new_value):
+        for cell, value in self.nogoods.assigned(index, new_value):
+            if self.values[cell] == value:
+                return False
+            bit = self.board.value_to_bit[value]
+            if self.values[cell] == 0 and self.domains[cell] & bit:
+                self.nogood_eliminations += 1
+                self.remove_values(cell, bit)
+        return True
+
+    # learn the nogoods found before a restart, the puzzle being back at its root: a nogood of a single
+    # assignment removes its value for good, the others are watched during the following runs
+    # returns False if they leave the puzzle without an answer
+    def record_nogoods(self, nogoods):
+        if self.nogoods is None:
+            self.nogoods = NogoodStore(self.values, self.board.size)
+        for nogood in nogoods:
+            if len(nogood) > 1:
+                self.nogoods.add(nogood)
+                continue
+            index, value = nogood[0]
+            bit = self.board.value_to_bit[value]
+            if self.domains[index] & bit:
+                self.nogood_eliminations += 1
+                self.remove_values(index, bit)
+        return self.is_valid() and self.AC_3()
+
+    # run AC-3 and report how much it pruned to the propagation policy
+    def propagate(self):
+        trail_length = self.trail_length
+        arcs_revised = self.arcs_revised
+        result = self.AC_3()
+        removed = self.trail_length - trail_length
+        self.propagations += 1
+        self.values_pruned += removed
+        if not result:
+            self.wipeouts += 1
+        self.policy.record(removed, self.arcs_revised - arcs_revised, not result)
+        return result
+
+    # unassign a value from a cell and revert changes to domains and degrees made since mark
+    def undo_assign(self, index, mark):
+        self.no_of_assignment -= 1
+        self.depth -= 1
+        for peer in self.board.peers[index]:
+            if self.values[peer] == 0:
+                self.degrees[peer] += 1
+        self.undo_to_mark(mark)
+        self.hash ^= self.keys[index][self.values[index]]
+        self.values[index] = 0
+        self.toggle_bucket(index)
+
+    # check if the current sudoku state is solvable, i.e. the root was consistent and no unassigned cell has
+    # an empty domain
+    def is_valid(self):
+        return self.consistent and self.buckets[0] == 0
+
+    # append a cell to the worklist unless it is already waiting there
+    def enqueue_cell(self, index):
+        if self.in_queue[index]:
+            self.duplicates_avoided += 1
+        else:
+            self.in_queue[index] = True
+            self.cells_enqueued += 1
+            self.queue.append(index)
+
+    # append a unit to the unit worklist unless it is already waiting there, and add mask to its changed values
+    def enqueue_unit(self, unit, mask):
+        if self.unit_changes[unit]:
+            self.duplicates_avoided += 1
+        else:
+            self.unit_queue.append(unit)
+        self.unit_changes[unit] |= mask
+
+    # Initialize the worklists with every unassigned cell that has a single value left, and every unit
+    def initialize_AC3_queue(self):
+        board = self.board
+        for index in board.cells:
+            if self.values[index] == 0 and board.popcount[self.domains[index]] == 1:
+                self.enqueue_cell(index)
+        for unit in range(board.unit_count):
+            self.enqueue_unit(unit, board.all_values)
+
+    # Seed the worklists with the trail entries from position on: the unassigned singleton cells, and the
+    # units of every changed cell with the values removed from it
+    def seed_AC3_queue(self, position):
+        board = self.board
+        for position in range(position, self.trail_length):
+            index = self.trail_cells[position]
+            if self.values[index] == 0 and board.popcount[self.domains[index]] == 1:
+                self.enqueue_cell(index)
+            for unit in board.units_of[index]:
+                self.enqueue_unit(unit, self.trail_masks[position])
+        return self.trail_length
+
+    # Revise the domain of index with the arc between index and peer
+    # Pre-condition: domain of peer has only 1 value
+    def revise(self, index, peer):
+        bit = self.domains[peer]
+        if self.popcount[bit] != 1 or not self.domains[index] & bit:
+            return False
+        self.remove_values(index, bit)
+        return True
+
+    # Revise the values in mask inside a unit: a value with no place left wipes the unit out, and a value
+    # with a single place left in an unassigned cell is a hidden single, so every other value is removed
+    def revise_unit(self, unit, mask):
+        self.units_revised += 1
+        board = self.board
+        for value in board.mask_values[mask]:
+            cells = self.places[unit * board.size + value - 1]
+            if cells == 0:
+                return False
+            if cells & (cells - 1) == 0:
+                index = cells.bit_length() - 1
+                bit = board.value_to_bit[value]
+                if self.values[index] == 0 and self.domains[index] != bit:
+                    self.hidden_singles += 1
+                    self.remove_values(index, self.domains[index] & ~bit)
+        return True
+
+    # empty the worklists after a wipeout so that the next call starts from a clean state
+    def clear_queue(self):
+        while self.queue:
+            self.in_queue[self.queue.popleft()] = False
+        while self.unit_queue:
+            self.unit_changes[self.unit_queue.popleft()] = 0
+
+    def AC_3(self):
+        position = self.seed_AC3_queue(self.fixpoints[-1])
+        queue = self.queue
+        unit_queue = self.unit_queue
+        peers = self.board.peers
+        while True:
+            while queue or unit_queue:
+                if queue:
+                    peer = queue.popleft()
+                    self.in_queue[peer] = False
+                    # revise the arc from every unassigned peer to the singleton cell
+                    for index in peers[peer]:
+                        if self.values[index] != 0:
+                            continue
+                        self.arcs_revised += 1
+                        if self.revise(index, peer) and self.domains[index] == 0:
+                            self.clear_queue()
+                            return False
+                else:
+                    unit = unit_queue.popleft()
+                    mask = self.unit_changes[unit]
+                    self.unit_changes[unit] = 0
+                    if not self.revise_unit(unit, mask):
+                        self.clear_queue()
+                        return False
+                position = self.seed_AC3_queue(position)
+            if not self.run_propagators():
+                return False
+            position = self.seed_AC3_queue(position)
+            if not queue and not unit_queue:
+                break
+        self.fixpoints.append(self.trail_length)
+        return True
+
+    # run the logical techniques in order of cost until one of them removes a value
+    # returns False if a technique wipes out a domain or finds a unit it cannot fill
+    def run_propagators(self):
+        for propagator in self.propagators:
+            trail_length = self.trail_length
+            if not propagator.propagate(self):
+                return False
+            if self.trail_length != trail_length:
+                return True
+        return True
+
+    def backtrack_search(self):
+        self.count += 1
+        if self.is_answer():
+            return True
+        if not self.is_valid():
+            return False
+        index = self.choose_cell_to_assign()
+        for value in self.values_to_assign(index):
+            undo, consistent = self.make_choice(index, value)
+            if consistent and self.backtrack_search():
+                return True
+            self.retract_choice(index, undo)
+        return False
+
+    # rule out a value at a cell for binary branching, and propagate the removal
+    # returns False if it wipes out a domain
+    def refute(self, index, value):
+        self.refutations += 1
+        self.remove_values(index, self.board.value_to_bit[value])
+        if not self.is_valid():
+            return False
+        return self.propagate()
+
+    # branches to take, for the iterative search driver: the values of a cell, the lowest value of a cell and
+    # its negation for x != v in binary branching, or the places of the value of a (unit, value) pair
+    def values_to_assign(self, index):
+        if isinstance(index, tuple):
+            unit, value = index
+            return cells_of(self.places[unit * self.size + value - 1])
+        values = self.board.mask_values[self.domains[index]]
+        if self.branching == "binary" and len(values) > 1:
+            return [values[0], -values[0]]
+        return values
+
+    # take a branch for the iterative search driver, undone back to the trail mark taken before it
+    def make_choice(self, index, value):
+        mark = self.trail_length
+        if isinstance(index, tuple):
+            return (value, mark), self.assign(value, index[1])
+        if value < 0:
+            return (None, mark), self.refute(index, -value)
+        return (index, mark), self.assign(index, value)
+
+    def retract_choice(self, index, undo):
+        cell, mark = undo
+        if cell is None:
+            self.undo_to_mark(mark)
+        else:
+            self.undo_assign(cell, mark)
+
+    # depth counts the assigned cells, so the puzzle is solved once all of them are assigned
+    def is_answer(self):
+        return self.consistent and self.depth == self.board.cell_count
+
+class Sudoku(object):
+    def __init__(self, puzzle, policy=None, propagators=None, restarts=None, seed=None, transpositions=None,
+                 size=None, branching="d-way"):
+        if branching not in BRANCHING_MODES:
+            raise ValueError("Unknown branching mode " + str(branching))
+        if restarts is not None and branching != "d-way":
+            raise ValueError("Restarts learn their nogoods from d-way branching only")
+        # you may add more attributes if you need
+        self.puzzle = puzzle  # self.puzzle is a list of lists
+        self.ans = puzzleCopy(puzzle)  # self.ans is a list of lists
+
+        self.board = getBoard(size if size is not None else len(puzzle)) # tables of the board size
+
+        self.depth = 0 # depth represent the number of cells that have been assigned value
+
+        board = self.board
+        self.values = [puzzle[board.row_of[index]][board.col_of[index]] for index in board.cells]
+
+        self.row_constraints = [board.all_values for i in range(board.size)]  # mask of values that haven't appeared in each row
+        self.col_constraints = [board.all_values for i in range(board.size)]  # mask of values that haven't appeared in each collumn
+        self.box_constraints = [board.all_values for i in range(board.size)]  # mask of values that haven't appeared in each box
+
+        self.initialize_constraints()
+
+        self.policy = policy if policy is not None else AdaptivePolicy()
+        self.propagators = propagators if propagators is not None else makePropagators(DEFAULT_PROPAGATORS)
+        self.restarts = restarts # restart schedule from search.RESTARTS, None to search without restarts
+        self.seed = seed # seed of the random tie-breaking between cells, None to break ties by lowest index
+        self.transpositions = transpositions # capacity of the table of failed states, None to search without one
+        self.branching = branching # one of BRANCHING_MODES
+        self.restart_count = 0
+        self.nogoods_learnt = 0
+        self.transposition_hits = 0
+        self.time = 0
+        for name in COUNTERS:
+            setattr(self, name, 0)
+
+    # initialize the row, collumn, and 3x3 box constraints of the Sudoku puzzle
+    def initialize_constraints(self):
+        board = self.board
+        for index in board.cells:
+            value = self.values[index]
+            if value != 0:
+                bit = board.value_to_bit[value]
+                self.depth += 1
+                self.row_constraints[board.row_of[index]] &= ~bit
+                self.col_constraints[board.col_of[index]] &= ~bit
+                self.box_constraints[board.box_of[index]] &= ~bit
+
+    def solve(self):
+        start_time = time.time()
+        sudokuPuzzle = SudokuPuzzle(self.values, self.row_constraints, self.col_constraints, self.box_constraints, self.depth,
+                                    self.policy, self.propagators, self.seed, self.board, self.branching)
+        table = TranspositionTable(self.transpositions) if self.transpositions is not None else None
+        if self.restarts is None:
+            IterativeSearch(sudokuPuzzle, table).run()
+        else:
+            search = RestartingSearch(sudokuPuzzle, RESTARTS[self.restarts](), table)
+            search.run()
+            self.restart_count = search.restarts
+            self.nogoods_learnt = search.nogoods
+        end_time = time.time()
+        self.time = end_time - start_time
+        for name in COUNTERS:
+            setattr(self, name, getattr(sudokuPuzzle, name))
+        if table is not None:
+            self.transposition_hits = table.hits
+        for index in self.board.cells:
+            self.ans[self.board.row_of[index]][self.board.col_of[index]] = sudokuPuzzle.values[index]
+        print("Variant (F): Most Constrained Variable with Most Constraining Variable + modified AC-3 on bitmask domains")
+        print("Time elapsed " + str(end_time - start_time))
+        print("Number of states traversed: " + str(sudokuPuzzle.count))
+        print("Peak trail length: " + str(sudokuPuzzle.max_trail_length))
+        print("AC-3 cells enqueued: " + str(sudokuPuzzle.cells_enqueued) + ", arcs revised: " + str(sudokuPuzzle.arcs_revised)
+              + ", duplicates avoided: " + str(sudokuPuzzle.duplicates_avoided))
+        print("Units revised: " + str(sudokuPuzzle.units_revised) + ", hidden singles: " + str(sudokuPuzzle.hidden_singles))
+        print("Propagation policy " + self.policy.name + ": " + str(sudokuPuzzle.propagations) + " propagations, "
+              + str(sudokuPuzzle.values_pruned) + " values pruned, " + str(sudokuPuzzle.wipeouts) + " wipeouts")
+        print("Branching " + self.branching + ": " + str(sudokuPuzzle.refutations) + " refutations, "
+              + str(sudokuPuzzle.unit_branches) + " unit branches")
+        for propagator in self.propagators:
+            print(propagator)
+        if self.restarts is not None:
+            print("Restarts (" + self.restarts + "): " + str(self.restart_count) + ", nogoods learnt: "
+                  + str(self.nogoods_learnt) + ", values removed by nogoods: " + str(sudokuPuzzle.nogood_eliminations))
+        if table is not None:
+            print("Transposition table: " + str(table.stores) + " failed states stored, " + str(table.hits) + " hits, "
+                  + str(table.evictions) + " evictions, " + str(len(table)) + " entries")
+        return self.ans
+
+if __name__ == "__main__":
+    # STRICTLY do NOT modify the code in the main function here
+    if len(sys.argv) != 3:
+        print ("\nUsage: python CS3243_P2_Sudoku_XX.py input.txt output.txt\n")
+        raise ValueError("Wrong number of arguments!")
+
+    try:
+        f = open(sys.argv[1], 'r')
+    except IOError:
+        print ("\nUsage: python CS3243_P2_Sudoku_XX.py input.txt output.txt\n")
+        raise IOError("Input file not found!")
+
+    puzzle = [[0 for i in range(9)] for j in range(9)]
+    lines = f.readlines()
+
+    i, j = 0, 0
+    for line in lines:
+        for number in line:
+            if '0' <= number <= '9':
+                puzzle[i][j] = int(number)
+                j += 1
+                if j == 9:
+                    i += 1
+                    j = 0
+
+    sudoku = Sudoku(puzzle)
+    ans = sudoku.solve()
+
+    with open(sys.argv[2], 'a') as f:
+        for i in range(9):
+            for j in range(9):
+                f.write(str(ans[i][j]) + " ")
+            f.write("\n")
@@ -0,0 +1,236 @@
+import sys
+import time
+from tables import CELLS, ROW_OF, COL_OF, BOX_OF
+
+# Running script: given code can be run with the command:
+# python file.py, ./path/to/init_state.txt ./output/output.txt
+
+# Variant (G): Dancing Links (Algorithm X) exact cover
+#
+# Sudoku as an exact cover problem: 729 candidate rows (cell, value), each covering 4 of 324 constraint
+# columns (the cell is filled, and the value appears once in the row, collumn and box of the cell).
+# The links are kept in flat lists indexed by node, where nodes 1 to 324 are the column headers and node 0
+# is the root. The search always branches on the column with the fewest rows left.
+
+COLUMN_COUNT = 4 * 81
+
+# the 4 constraint columns covered by placing value (1-9) at a cell
+def candidate_columns(index, value):
+    digit = value - 1
+    return [1 + index,
+            1 + 81 + ROW_OF[index] * 9 + digit,
+            1 + 162 + COL_OF[index] * 9 + digit,
+            1 + 243 + BOX_OF[index] * 9 + digit]
+
+def puzzleCopy(puzzle):
+    puzzle_copy = [[puzzle[i][j] for j in range(9)] for i in range(9)]
+    return puzzle_copy
+
+class DancingLinks:
+    def __init__(self, column_count):
+        self.left = [column - 1 for column in range(column_count + 1)]
+        self.left[0] = column_count
+        self.right = [column + 1 for column in range(column_count + 1)]
+        self.right[column_count] = 0
+        self.up = list(range(column_count + 1))
+        self.down = list(range(column_count + 1))
+        self.column = list(range(column_count + 1)) # column header of each node
+        self.row = [-1] * (column_count + 1) # candidate row of each node
+        self.size = [0] * (column_count + 1) # number of rows left in each column
+        self.first_node = dict() # first node of each candidate row
+        self.solution = [] # candidate rows chosen on the current search path
+        self.count = 0 # number of states traversed
+
+    # append a candidate row covering the given columns
+    def add_row(self, row, columns):
+        first = None
+        for column in columns:
+            node = len(self.column)
+            self.column.append(column)
+            self.row.append(row)
+            self.up.append(self.up[column])
+            self.down.append(column)
+            self.down[self.up[column]] = node
+            self.up[column] = node
+            self.size[column] += 1
+            if first is None:
+                first = node
+                self.left.append(node)
+                self.right.append(node)
+            else:
+                self.left.append(self.left[first])
+                self.right.append(first)
+                self.right[self.left[first]] = node
+                self.left[first] = node
+        self.first_node[row] = first
+
+    # remove a column from the header list and every row crossing it from the other columns
+    def cover(self, column):
+        left, right, up, down, size, columns = self.left, self.right, self.up, self.down, self.size, self.column
+        right[left[column]] = right[column]
+        left[right[column]] = left[column]
+        i = down[column]
+        while i != column:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[columns[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    # put back a column removed by cover, in the reverse order
+    def uncover(self, column):
+        left, right, up, down, size, columns = self.left, self.right, self.up, self.down, self.size, self.column
+        i = up[column]
+        while i != column:
+            j = left[i]
+            while j != i:
+                size[columns[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[column]] = column
+        left[right[column]] = column
+
+    # choose a candidate row before the search starts, returns False if one of its columns is already covered
+    def select(self, row):
+        node = self.first_node[row]
+        columns = [self.column[node]]
+        j = self.right[node]
+        while j != node:
+            columns.append(self.column[j])
+            j = self.right[j]
+        for column in columns:
+            if self.right[self.left[column]] != column:
+                return False
+            self.cover(column)
+        self.solution.append(row)
+        return True
+
+    # choose the uncovered column with the fewest rows left
+    def choose_column(self):
+        chosen = None
+        min_size = sys.maxsize
+        column = self.right[0]
+        while column != 0:
+            if self.size[column] < min_size:
+                min_size = self.size[column]
+                chosen = column
+                if min_size <= 1:
+                    break
+            column = self.right[column]
+        return chosen
+
+    # Algorithm X: calls found with the chosen rows of every exact cover, and stops once found returns True
+    def search(self, found):
+        self.count += 1
+        if self.right[0] == 0:
+            return found(self.solution)
+        column = self.choose_column()
+        if self.size[column] == 0:
+            return False
+        self.cover(column)
+        node = self.down[column]
+        stop = False
+        while node != column and not stop:
+            self.solution.append(self.row[node])
+            j = self.right[node]
+            while j != node:
+                self.cover(self.column[j])
+                j = self.right[j]
+            stop = self.search(found)
+            j = self.left[node]
+            while j != node:
+                self.uncover(self.column[j])
+                j = self.left[j]
+            self.solution.pop()
+            node = self.down[node]
+        self.uncover(column)
+        return stop
+
+class Sudoku(object):
+    def __init__(self, puzzle):
+        # you may add more attributes if you need
+        self.puzzle = puzzle  # self.puzzle is a list of lists
+        self.ans = puzzleCopy(puzzle)  # self.ans is a list of lists
+
+        self.time = 0
+        self.count = 0
+
+    # build the exact cover matrix and select the rows of the given values
+    # returns None if two given values clash
+    def build_links(self):
+        links = DancingLinks(COLUMN_COUNT)
+        for index in CELLS:
+            for value in range(1, 10):
+                links.add_row(index * 9 + value - 1, candidate_columns(index, value))
+        for index in CELLS:
+            value = self.puzzle[ROW_OF[index]][COL_OF[index]]
+            if value != 0 and not links.select(index * 9 + value - 1):
+                return None
+        return links
+
+    # count the solutions of the puzzle, stopping once limit of them are found
+    def count_solutions(self, limit=2):
+        links = self.build_links()
+        solutions = [0]
+        def found(rows):
+            solutions[0] += 1
+            return solutions[0] >= limit
+        if links is not None:
+            links.search(found)
+        return solutions[0]
+
+    def solve(self):
+        start_time = time.time()
+        links = self.build_links()
+        def found(rows):
+            for row in rows:
+                index, digit = divmod(row, 9)
+                self.ans[ROW_OF[index]][COL_OF[index]] = digit + 1
+            return True
+        if links is not None:
+            links.search(found)
+            self.count = links.count
+        end_time = time.time()
+        self.time = end_time - start_time
+        print("Variant (G): Dancing Links (Algorithm X) exact cover")
+        print("Time elapsed " + str(end_time - start_time))
+        print("Number of states traversed: " + str(self.count))
+        return self.ans
+
+if __name__ == "__main__":
+    # STRICTLY do NOT modify the code in the main function here
+    if len(sys.argv) != 3:
+        print ("\nUsage: python CS3243_P2_Sudoku_XX.py input.txt output.txt\n")
+        raise ValueError("Wrong number of arguments!")
+
+    try:
+        f = open(sys.argv[1], 'r')
+    except IOError:
+        print ("\nUsage: python CS3243_P2_Sudoku_XX.py input.txt output.txt\n")
+        raise IOError("Input file not found!")
+
+    puzzle = [[0 for i in range(9)] for j in range(9)]
+    lines = f.readlines()
+
+    i, j = 0, 0
+    for line in lines:
+        for number in line:
+            if '0' <= number <= '9':
+                puzzle[i][j] = int(number)
+                j += 1
+                if j == 9:
+                    i += 1
+                    j = 0
+
+    sudoku = Sudoku(puzzle)
+    ans = sudoku.solve()
+
+    with open(sys.argv[2], 'a') as f:
+        for i in range(9):
+            for j in range(9):
+                f.write(str(ans[i][j]) + " ")
+            f.write("\n")
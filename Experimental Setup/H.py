@@ -0,0 +1,310 @@
+import sys
+import time
+from heapq import heappush, heappop, heapify
+from tables import CELLS, ROW_OF, COL_OF, UNITS
+
+# Running script: given code can be run with the command:
+# python file.py, ./path/to/init_state.txt ./output/output.txt
+
+# Variant (H): CDCL SAT solver on the Sudoku CNF encoding
+#
+# Variable (index * 9 + value - 1) is true when the cell at flat index holds value, giving 729 variables.
+# Literal 2 * var is the variable and 2 * var + 1 its negation, so lit ^ 1 negates a literal. Every cell
+# holds at least one and at most one value, and every value appears at least once and at most once in each
+# row, collumn and box. The at-most-one constraints are pairwise binary clauses.
+#
+# Unit propagation watches two literals of every clause, so a clause is only visited when one of its
+# watched literals becomes false. A conflict is analysed back to its first unique implication point, and the
+# learnt clause is added before backjumping to the second highest level in it. Branching takes the free
+# variable with the highest VSIDS activity, bumped for every variable met during conflict analysis.
+
+VAR_DECAY = 0.95
+RESCALE_LIMIT = 1e100
+
+# clauses of the Sudoku encoding, as lists of literals
+def sudokuClauses():
+    groups = []
+    for index in CELLS:
+        groups.append([index * 9 + digit for digit in range(9)])
+    for unit in UNITS:
+        for digit in range(9):
+            groups.append([index * 9 + digit for index in unit])
+    clauses = []
+    for group in groups:
+        clauses.append([2 * var for var in group])
+        for i in range(len(group)):
+            for j in range(i + 1, len(group)):
+                clauses.append([2 * group[i] + 1, 2 * group[j] + 1])
+    return clauses
+
+def puzzleCopy(puzzle):
+    puzzle_copy = [[puzzle[i][j] for j in range(9)] for i in range(9)]
+    return puzzle_copy
+
+class SatSolver:
+    def __init__(self, var_count, clauses):
+        self.var_count = var_count
+        self.lit_value = [0] * (2 * var_count) # 1 for true, -1 for false, 0 for unassigned
+        self.level = [0] * var_count
+        self.reason = [None] * var_count # clause that implied each variable, None for decisions
+        self.trail = [] # assigned literals, in order
+        self.trail_lim = [] # trail length at each decision
+        self.qhead = 0 # next trail literal to propagate
+        self.clauses = []
+        self.watches = [[] for lit in range(2 * var_count)] # clauses watching each literal
+        self.activity = [0.0] * var_count
+        self.var_inc = 1.0
+        self.order = [(0.0, var) for var in range(var_count)] # lazy max-heap of activities
+        self.seen = [False] * var_count
+
+        self.count = 0 # number of decisions
+        self.conflicts = 0
+        self.propagations = 0
+        self.learnt_clauses = 0
+        self.learnt_literals = 0
+
+        self.consistent = True
+        for clause in clauses:
+            if not self.add_clause(list(clause)):
+                self.consistent = False
+
+    def decision_level(self):
+        return len(self.trail_lim)
+
+    # add an original clause at level 0, returns False if it is already falsified
+    def add_clause(self, clause):
+        if len(clause) == 1:
+            return self.enqueue(clause[0], None)
+        clause_index = len(self.clauses)
+        self.clauses.append(clause)
+        self.watches[clause[0]].append(clause_index)
+        self.watches[clause[1]].append(clause_index)
+        return True
+
+    # make a literal true, returns False if it is already false
+    def enqueue(self, lit, reason):
+        value = self.lit_value[lit]
+        if value != 0:
+            return value == 1
+        var = lit >> 1
+        self.lit_value[lit] = 1
+        self.lit_value[lit ^ 1] = -1
+        self.level[var] = self.decision_level()
+        self.reason[var] = reason
+        self.trail.append(lit)
+        return True
+
+    # two watched literal unit propagation, returns the index of a conflicting clause or None
+    def propagate(self):
+        lit_value, clauses, watches, trail = self.lit_value, self.clauses, self.watches, self.trail
+        while self.qhead < len(trail):
+            false_lit = trail[self.qhead] ^ 1
+            self.qhead += 1
+            self.propagations += 1
+            watch_list = watches[false_lit]
+            kept = []
+            k = 0
+            while k < len(watch_list):
+                clause_index = watch_list[k]
+                k += 1
+                clause = clauses[clause_index]
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                first = clause[0]
+                if lit_value[first] == 1:
+                    kept.append(clause_index)
+                    continue
+                for m in range(2, len(clause)):
+                    if lit_value[clause[m]] != -1:
+                        clause[1], clause[m] = clause[m], false_lit
+                        watches[clause[1]].append(clause_index)
+                        break
+                else:
+                    kept.append(clause_index)
+                    if lit_value[first] == -1:
+                        kept.extend(watch_list[k:])
+                        watches[false_lit] = kept
+                        return clause_index
+                    self.enqueue(first, clause_index)
+            watches[false_lit] = kept
+        return None
+
+    # raise the activity of a variable, rescaling every activity once they grow too large
+    def bump(self, var):
+        self.activity[var] += self.var_inc
+        if self.activity[var] > RESCALE_LIMIT:
+            self.activity = [activity / RESCALE_LIMIT for activity in self.activity]
+            self.var_inc /= RESCALE_LIMIT
+            self.order = [(-self.activity[var], var) for var in range(self.var_count)]
+            heapify(self.order)
+        elif self.lit_value[2 * var] == 0:
+            heappush(self.order, (-self.activity[var], var))
+
+    # 1-UIP conflict analysis, returns the learnt clause (asserting literal first) and the backjump level
+    def analyze(self, clause_index):
+        seen, level, trail = self.seen, self.level, self.trail
+        current_level = self.decision_level()
+        learnt = [None]
+        counter = 0
+        lit = None
+        position = len(trail) - 1
+        clause = self.clauses[clause_index]
+        while True:
+            for other in (clause if lit is None else clause[1:]):
+                var = other >> 1
+                if not seen[var] and level[var] > 0:
+                    seen[var] = True
+                    self.bump(var)
+                    if level[var] == current_level:
+                        counter += 1
+                    else:
+                        learnt.append(other)
+            while not seen[trail[position] >> 1]:
+                position -= 1
+            lit = trail[position]
+            position -= 1
+            seen[lit >> 1] = False
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self.clauses[self.reason[lit >> 1]]
+        learnt[0] = lit ^ 1
+        for other in learnt[1:]:
+            seen[other >> 1] = False
+
+        backjump_level = 0
+        if len(learnt) > 1:
+            highest = 1
+            for i in range(2, len(learnt)):
+                if level[learnt[i] >> 1] > level[learnt[highest] >> 1]:
+                    highest = i
+            learnt[1], learnt[highest] = learnt[highest], learnt[1]
+            backjump_level = level[learnt[1] >> 1]
+        self.var_inc /= VAR_DECAY
+        return learnt, backjump_level
+
+    # undo every assignment above the given decision level
+    def cancel_until(self, target_level):
+        if self.decision_level() <= target_level:
+            return
+        mark = self.trail_lim[target_level]
+        for lit in self.trail[mark:]:
+            var = lit >> 1
+            self.lit_value[lit] = 0
+            self.lit_value[lit ^ 1] = 0
+            self.reason[var] = None
+            heappush(self.order, (-self.activity[var], var))
+        del self.trail[mark:]
+        del self.trail_lim[target_level:]
+        self.qhead = mark
+
+    # free variable with the highest activity, or None if every variable is assigned
+    def pick_branch_var(self):
+        while self.order:
+            activity, var = heappop(self.order)
+            if self.lit_value[2 * var] == 0 and -activity == self.activity[var]:
+                return var
+        for var in range(self.var_count):
+            if self.lit_value[2 * var] == 0:
+                return var
+        return None
+
+    # returns True if the clauses are satisfiable, leaving a model in lit_value
+    def solve(self):
+        if not self.consistent:
+            return False
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if self.decision_level() == 0:
+                    return False
+                learnt, backjump_level = self.analyze(conflict)
+                self.cancel_until(backjump_level)
+                if len(learnt) == 1:
+                    self.enqueue(learnt[0], None)
+                else:
+                    clause_index = len(self.clauses)
+                    self.clauses.append(learnt)
+                    self.watches[learnt[0]].append(clause_index)
+                    self.watches[learnt[1]].append(clause_index)
+                    self.enqueue(learnt[0], clause_index)
+                self.learnt_clauses += 1
+                self.learnt_literals += len(learnt)
+            else:
+                var = self.pick_branch_var()
+                if var is None:
+                    return True
+                self.count += 1
+                self.trail_lim.append(len(self.trail))
+                self.enqueue(2 * var, None)
+
+class Sudoku(object):
+    def __init__(self, puzzle):
+        # you may add more attributes if you need
+        self.puzzle = puzzle  # self.puzzle is a list of lists
+        self.ans = puzzleCopy(puzzle)  # self.ans is a list of lists
+
+        self.time = 0
+        self.count = 0
+        self.conflicts = 0
+        self.learnt_clauses = 0
+
+    def solve(self):
+        start_time = time.time()
+        clauses = sudokuClauses()
+        for index in CELLS:
+            value = self.puzzle[ROW_OF[index]][COL_OF[index]]
+            if value != 0:
+                clauses.append([2 * (index * 9 + value - 1)])
+        solver = SatSolver(81 * 9, clauses)
+        if solver.solve():
+            for index in CELLS:
+                for value in range(1, 10):
+                    if solver.lit_value[2 * (index * 9 + value - 1)] == 1:
+                        self.ans[ROW_OF[index]][COL_OF[index]] = value
+        self.count = solver.count
+        self.conflicts = solver.conflicts
+        self.learnt_clauses = solver.learnt_clauses
+        end_time = time.time()
+        self.time = end_time - start_time
+        print("Variant (H): CDCL SAT solver with two watched literals, 1-UIP learning and VSIDS")
+        print("Time elapsed " + str(end_time - start_time))
+        print("Number of states traversed: " + str(self.count))
+        print("Conflicts: " + str(solver.conflicts) + ", learnt clauses: " + str(solver.learnt_clauses) +
+              ", learnt literals: " + str(solver.learnt_literals) + ", propagations: " + str(solver.propagations))
+        return self.ans
+
+if __name__ == "__main__":
+    # STRICTLY do NOT modify the code in the main function here
+    if len(sys.argv) != 3:
+        print ("\nUsage: python CS3243_P2_Sudoku_XX.py input.txt output.txt\n")
+        raise ValueError("Wrong number of arguments!")
+
+    try:
+        f = open(sys.argv[1], 'r')
+    except IOError:
+        print ("\nUsage: python CS3243_P2_Sudoku_XX.py input.txt output.txt\n")
+        raise IOError("Input file not found!")
+
+    puzzle = [[0 for i in range(9)] for j in range(9)]
+    lines = f.readlines()
+
+    i, j = 0, 0
+    for line in lines:
+        for number in line:
+            if '0' <= number <= '9':
+                puzzle[i][j] = int(number)
+                j += 1
+                if j == 9:
+                    i += 1
+                    j = 0
+
+    sudoku = Sudoku(puzzle)
+    ans = sudoku.solve()
+
+    with open(sys.argv[2], 'a') as f:
+        for i in range(9):
+            for j in range(9):
+                f.write(str(ans[i][j]) + " ")
+            f.write("\n")
@@ -0,0 +1,218 @@
+import sys
+import time
+from search import IterativeSearch
+from tables import CELLS, ROW_OF, COL_OF, UNIT_MASKS, PEER_MASKS, CELL_BIT
+
+# Running script: given code can be run with the command:
+# python file.py, ./path/to/init_state.txt ./output/output.txt
+
+# Variant (I): digit-plane bitboards
+#
+# The whole state is nine 81-bit integers, one plane per digit with the bit of every cell where that digit
+# can still go, and an 81-bit integer of the assigned cells. Placing a digit clears the peers of its cell
+# from its plane and the cell from the eight other planes, so propagation works on whole planes with a few
+# big-int operations instead of looping over cells. Saving the state before an assignment copies nine ints
+# and a mask, and undoing it puts them back.
+#
+# After every assignment, propagation repeats until nothing changes:
+#   naked singles: adding the planes up bit by bit gives the cells with at least one and at least two digits
+#                  left, so an unassigned cell with no digit is a wipeout and one with a single digit is placed
+#   hidden singles: a digit with a single place in a unit where it is not placed yet goes there, and a digit
+#                   with no place in such a unit is a wipeout
+# Branching takes the first unassigned cell with two digits left, then three, then any other.
+
+FULL = (1 << 81) - 1
+
+def puzzleCopy(puzzle):
+    puzzle_copy = [[puzzle[i][j] for j in range(9)] for i in range(9)]
+    return puzzle_copy
+
+# index of the lowest cell inside an 81-bit set of cells
+def lowest_cell(cells):
+    return (cells & -cells).bit_length() - 1
+
+class SudokuPuzzle:
+    def __init__(self, values):
+        self.planes = [FULL] * 9 # cells where each digit (value - 1) can still go
+        self.assigned = 0 # cells that hold a value
+        self.count = 0 # number of states traversed
+        self.naked_singles = 0
+        self.hidden_singles = 0
+        self.consistent = True
+        for index in CELLS:
+            if values[index] != 0:
+                if not self.planes[values[index] - 1] & CELL_BIT[index]:
+                    self.consistent = False
+                    break
+                self.place(index, values[index] - 1)
+        if self.consistent:
+            self.consistent = self.propagate()
+
+    def __str__(self):
+        values = self.values()
+        out = ""
+        for row in range(9):
+            for col in range(9):
+                out = out + " " + str(values[row * 9 + col])
+            out = out + "\n"
+        return out
+
+    # flat list of cell values, 0 if unassigned
+    def values(self):
+        values = [0] * 81
+        for digit in range(9):
+            cells = self.planes[digit] & self.assigned
+            while cells:
+                bit = cells & -cells
+                cells ^= bit
+                values[bit.bit_length() - 1] = digit + 1
+        return values
+
+    # put digit at a cell: it leaves the other planes, and its peers leave the plane of digit
+    def place(self, index, digit):
+        bit = CELL_BIT[index]
+        planes = self.planes
+        for other in range(9):
+            if other != digit:
+                planes[other] &= ~bit
+        planes[digit] &= ~PEER_MASKS[index]
+        self.assigned |= bit
+
+    # cells with at least one, two, three and four digits left
+    def digit_counts(self):
+        one = two = three = four = 0
+        for plane in self.planes:
+            four |= three & plane
+            three |= two & plane
+            two |= one & plane
+            one |= plane
+        return one, two, three, four
+
+    # place naked and hidden singles until none is left, returns False on a wipeout
+    def propagate(self):
+        planes = self.planes
+        while True:
+            one, two, three, four = self.digit_counts()
+            free = FULL & ~self.assigned
+            if free & ~one:
+                return False
+            singles = free & ~two
+            if singles:
+                while singles:
+                    bit = singles & -singles
+                    singles ^= bit
+                    index = bit.bit_length() - 1
+                    for digit in range(9):
+                        if planes[digit] & bit:
+                            break
+                    else:
+                        return False # an earlier single took its last digit
+                    self.naked_singles += 1
+                    self.place(index, digit)
+                continue
+            found = False
+            for digit in range(9):
+                for unit_mask in UNIT_MASKS:
+                    cells = planes[digit] & unit_mask
+                    if cells & self.assigned:
+                        continue
+                    if cells == 0:
+                        return False
+                    if cells & (cells - 1) == 0:
+                        self.hidden_singles += 1
+                        self.place(cells.bit_length() - 1, digit)
+                        found = True
+            if not found:
+                return True
+
+    # choose the index of the next cell to be assigned
+    # heuristics: Most Constrained Variable among cells with two or three digits left, then lowest index
+    def choose_cell_to_assign(self):
+        one, two, three, four = self.digit_counts()
+        free = FULL & ~self.assigned
+        for cells in (free & ~three, free & ~four, free):
+            if cells:
+                return lowest_cell(cells)
+        return None
+
+    def is_valid(self):
+        return self.consistent
+
+    def is_answer(self):
+        return self.consistent and self.assigned == FULL
+
+    # values to try at a cell, for the iterative search driver
+    def values_to_assign(self, index):
+        bit = CELL_BIT[index]
+        return [digit + 1 for digit in range(9) if self.planes[digit] & bit]
+
+    # assign a value for the iterative search driver, saving the nine planes and the assigned cells to undo it
+    def make_choice(self, index, value):
+        saved = (tuple(self.planes), self.assigned)
+        self.place(index, value - 1)
+        self.consistent = self.propagate()
+        return saved, self.consistent
+
+    def retract_choice(self, index, saved):
+        self.planes = list(saved[0])
+        self.assigned = saved[1]
+        self.consistent = True
+
+class Sudoku(object):
+    def __init__(self, puzzle):
+        # you may add more attributes if you need
+        self.puzzle = puzzle  # self.puzzle is a list of lists
+        self.ans = puzzleCopy(puzzle)  # self.ans is a list of lists
+
+        self.time = 0
+        self.count = 0
+
+    def solve(self):
+        start_time = time.time()
+        sudokuPuzzle = SudokuPuzzle([self.puzzle[ROW_OF[index]][COL_OF[index]] for index in CELLS])
+        IterativeSearch(sudokuPuzzle).run()
+        values = sudokuPuzzle.values()
+        for index in CELLS:
+            self.ans[ROW_OF[index]][COL_OF[index]] = values[index]
+        end_time = time.time()
+        self.time = end_time - start_time
+        self.count = sudokuPuzzle.count
+        print("Variant (I): digit-plane bitboards with naked and hidden singles")
+        print("Time elapsed " + str(end_time - start_time))
+        print("Number of states traversed: " + str(sudokuPuzzle.count))
+        print("Naked singles: " + str(sudokuPuzzle.naked_singles) + ", hidden singles: " + str(sudokuPuzzle.hidden_singles))
+        return self.ans
+
+if __name__ == "__main__":
+    # STRICTLY do NOT modify the code in the main function here
+    if len(sys.argv) != 3:
+        print ("\nUsage: python CS3243_P2_Sudoku_XX.py input.txt output.txt\n")
+        raise ValueError("Wrong number of arguments!")
+
+    try:
+        f = open(sys.argv[1], 'r')
+    except IOError:
+        print ("\nUsage: python CS3243_P2_Sudoku_XX.py input.txt output.txt\n")
+        raise IOError("Input file not found!")
+
+    puzzle = [[0 for i in range(9)] for j in range(9)]
+    lines = f.readlines()
+
+    i, j = 0, 0
+    for line in lines:
+        for number in line:
+            if '0' <= number <= '9':
+                puzzle[i][j] = int(number)
+                j += 1
+                if j == 9:
+                    i += 1
+                    j = 0
+
+    sudoku = Sudoku(puzzle)
+    ans = sudoku.solve()
+
+    with open(sys.argv[2], 'a') as f:
+        for i in range(9):
+            for j in range(9):
+                f.write(str(ans[i][j]) + " ")
+            f.write("\n")
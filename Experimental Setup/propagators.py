@@ -0,0 +1,286 @@
+import time
+from itertools import combinations
+
+# Logical techniques that variant (F) runs once its AC-3 and hidden single worklists are empty.
+#
+# Each propagator scans the board of a SudokuPuzzle from F.py, with the tables of its size in puzzle.board,
+# and removes values through remove_values, so every removal lands on the trail and seeds the next round of
+# AC-3. Propagators run in increasing order of cost, and after one of them removes something the cheaper
+# propagation runs again before the next one.
+
+# number of cells inside a set of cells
+def count_cells(cells):
+    return bin(cells).count("1")
+
+# flat indices of the cells inside a set of cells
+def cells_of(cells):
+    indices = []
+    while cells:
+        bit = cells & -cells
+        cells ^= bit
+        indices.append(bit.bit_length() - 1)
+    return indices
+
+class Propagator(object):
+    name = None
+    cost = 0 # propagators run in increasing order of cost
+
+    def __init__(self):
+        self.calls = 0
+        self.eliminations = 0 # number of values removed
+        self.time = 0.0
+
+    # run the technique once over the whole board, returns False if it wipes out a domain
+    def propagate(self, puzzle):
+        self.calls += 1
+        start_time = time.time()
+        result = self.run(puzzle)
+        self.time += time.time() - start_time
+        return result
+
+    def run(self, puzzle):
+        raise NotImplementedError
+
+    # remove the values in mask from the domain of an unassigned cell, returns False if it wipes it out
+    def eliminate(self, puzzle, index, mask):
+        mask &= puzzle.domains[index]
+        if mask:
+            self.eliminations += puzzle.board.popcount[mask]
+            puzzle.remove_values(index, mask)
+        return puzzle.domains[index] != 0
+
+    def __str__(self):
+        return "%s: %d calls, %d eliminations, %.5fs" % (self.name, self.calls, self.eliminations, self.time)
+
+# pointing and claiming: if the places of a value inside a box all lie on one row or collumn, the value
+# cannot go anywhere else on that line, and if its places inside a line all lie in one box, it cannot go
+# anywhere else in that box
+class IntersectionRemoval(Propagator):
+    name = "intersections"
+    cost = 1
+
+    def run(self, puzzle):
+        board = puzzle.board
+        size = board.size
+        for unit in range(board.unit_count):
+            for value in board.values:
+                cells = puzzle.places[unit * size + value - 1]
+                if cells & (cells - 1) == 0:
+                    continue # placed, hidden single or wiped out, all handled by AC-3
+                first = (cells & -cells).bit_length() - 1
+                for other in board.units_of[first]:
+                    if other == unit or (unit < 2 * size) == (other < 2 * size) or cells & ~board.unit_masks[other]:
+                        continue
+                    for index in cells_of(puzzle.places[other * size + value - 1] & ~cells):
+                        if not self.eliminate(puzzle, index, board.value_to_bit[value]):
+                            return False
+        return True
+
+# naked subsets: if n unassigned cells of a unit hold only n values between them, those values cannot go in
+# any other cell of the unit
+class NakedSubsets(Propagator):
+    def __init__(self, size):
+        Propagator.__init__(self)
+        self.size = size
+        self.name = ["", "", "naked pairs", "naked triples"][size]
+        self.cost = size
+
+    def run(self, puzzle):
+        board = puzzle.board
+        popcount = board.popcount
+        for unit in range(board.unit_count):
+            unassigned = [index for index in board.units[unit] if puzzle.values[index] == 0]
+            if len(unassigned) <= self.size:
+                continue
+            candidates = [index for index in unassigned if popcount[puzzle.domains[index]] <= self.size]
+            for subset in combinations(candidates, self.size):
+                union = 0
+                for index in subset:
+                    union |= puzzle.domains[index]
+                if popcount[union] < self.size:
+                    return False
+                if popcount[union] > self.size:
+                    continue
+                for index in unassigned:
+                    if index not in subset and not self.eliminate(puzzle, index, union):
+                        return False
+        return True
+
+# hidden subsets: if n values of a unit can only go in the same n cells, those cells cannot hold any other
+# value
+class HiddenSubsets(Propagator):
+    def __init__(self, size):
+        Propagator.__init__(self)
+        self.size = size
+        self.name = ["", "", "hidden pairs", "hidden triples"][size]
+        self.cost = size + 1
+
+    def run(self, puzzle):
+        board = puzzle.board
+        size = board.size
+        for unit in range(board.unit_count):
+            candidates = []
+            for value in board.values:
+                cells = puzzle.places[unit * size + value - 1]
+                if cells & (cells - 1) and count_cells(cells) <= self.size:
+                    candidates.append(value)
+            for subset in combinations(candidates, self.size):
+                union = 0
+                mask = 0
+                for value in subset:
+                    union |= puzzle.places[unit * size + value - 1]
+                    mask |= board.value_to_bit[value]
+                count = count_cells(union)
+                if count < self.size:
+                    return False
+                if count > self.size:
+                    continue
+                for index in cells_of(union):
+                    if not self.eliminate(puzzle, index, ~mask):
+                        return False
+        return True
+
+# generalized arc consistency on every unit as one all-different constraint (Regin): a value stays in the
+# domain of a cell only if some assignment of distinct values to the whole unit gives it to that cell
+#
+# Once AC-3 has removed the values placed in a unit from its other cells, its unassigned cells must take the
+# values left, one each, which is a perfect matching between them. The matching is kept from one call to the
+# next and repaired by augmenting paths from the cells whose matched value left their domain; without a
+# perfect matching the unit cannot be filled. Otherwise, following a cell to its matched value and from
+# there to any other cell that could take that value gives a graph on the cells, and a value can only go in
+# an unmatched cell of the same strongly connected component as the cell matched to it. This subsumes the
+# naked and hidden subsets of every size, on one unit at a time.
+#
+# F records a fixpoint only once every propagator has left the domains alone, so every unit was consistent
+# there, and a call only revises the units of the cells changed on the trail since the last fixpoint.
+class AllDifferent(Propagator):
+    name = "all-different"
+    cost = 5
+
+    def __init__(self):
+        Propagator.__init__(self)
+        self.puzzle = None # puzzle of the matchings, revised in full on its first call
+        self.matched_cell = None # cell matched to each value of each unit, at unit * N + value - 1, -1 if none
+        self.matched_value = None # value matched to each cell inside each of its units, at unit * N * N + index
+        self.units_revised = 0
+        self.augmentations = 0 # augmenting paths found while repairing matchings
+
+    def run(self, puzzle):
+        board = puzzle.board
+        if self.puzzle is not puzzle:
+            self.puzzle = puzzle
+            self.matched_cell = [-1] * (board.unit_count * board.size)
+            self.matched_value = [0] * (board.unit_count * board.cell_count)
+            units = range(board.unit_count)
+        else:
+            units = set()
+            for position in range(puzzle.fixpoints[-1], puzzle.trail_length):
+                units.update(board.units_of[puzzle.trail_cells[position]])
+            units = sorted(units)
+        for unit in units:
+            if not self.revise_unit(puzzle, unit):
+                return False
+        return True
+
+    def revise_unit(self, puzzle, unit):
+        board = puzzle.board
+        cells = [index for index in board.units[unit] if puzzle.values[index] == 0]
+        if len(cells) < 2:
+            return True
+        self.units_revised += 1
+        base = unit * board.size - 1
+        cell_base = unit * board.cell_count
+        matched_cell = self.matched_cell
+        matched_value = self.matched_value
+
+        # keep the pairs whose value is still in the domain of their cell, then match the cells left over
+        for value in board.values:
+            matched_cell[base + value] = -1
+        free = []
+        for index in cells:
+            value = matched_value[cell_base + index]
+            if value and puzzle.domains[index] & board.value_to_bit[value] and matched_cell[base + value] == -1:
+                matched_cell[base + value] = index
+            else:
+                matched_value[cell_base + index] = 0
+                free.append(index)
+        for index in free:
+            if not self.augment(puzzle, unit, index, set()):
+                return False
+            self.augmentations += 1
+
+        # strongly connected components of the cells, each cell pointing to the other cells whose domain
+        # holds its matched value
+        successors = {}
+        for index in cells:
+            value = matched_value[cell_base + index]
+            successors[index] = cells_of(puzzle.places[base + value] & ~board.cell_bit[index])
+        component = strongComponents(cells, successors)
+
+        for index in cells:
+            mask = 0
+            matched = matched_value[cell_base + index]
+            for value in board.mask_values[puzzle.domains[index]]:
+                if value != matched and component[matched_cell[base + value]] != component[index]:
+                    mask |= board.value_to_bit[value]
+            if mask and not self.eliminate(puzzle, index, mask):
+                return False
+        return True
+
+    # look for an augmenting path from a cell without a value, returns True once the cell is matched
+    def augment(self, puzzle, unit, index, visited):
+        board = puzzle.board
+        base = unit * board.size - 1
+        for value in board.mask_values[puzzle.domains[index]]:
+            if value in visited:
+                continue
+            visited.add(value)
+            other = self.matched_cell[base + value]
+            if other == -1 or self.augment(puzzle, unit, other, visited):
+                self.matched_cell[base + value] = index
+                self.matched_value[unit * board.cell_count + index] = value
+                return True
+        return False
+
+    def __str__(self):
+        return Propagator.__str__(self) + ", %d units revised, %d augmenting paths" % (self.units_revised,
+                                                                                     self.augmentations)
+
+# component number of every node of a directed graph, from Tarjan's algorithm
+def strongComponents(nodes, successors):
+    order = {}
+    low = {}
+    component = {}
+    stack = []
+    def visit(node):
+        order[node] = low[node] = len(order)
+        stack.append(node)
+        for successor in successors[node]:
+            if successor not in order:
+                visit(successor)
+                low[node] = min(low[node], low[successor])
+            elif successor not in component:
+                low[node] = min(low[node], order[successor])
+        if low[node] == order[node]:
+            while True:
+                member = stack.pop()
+                component[member] = node
+                if member == node:
+                    break
+    for node in nodes:
+        if node not in order:
+            visit(node)
+    return component
+
+PROPAGATORS = {
+    "intersections": IntersectionRemoval,
+    "naked-pairs": lambda: NakedSubsets(2),
+    "naked-triples": lambda: NakedSubsets(3),
+    "hidden-pairs": lambda: HiddenSubsets(2),
+    "hidden-triples": lambda: HiddenSubsets(3),
+    "all-different": AllDifferent,
+}
+
+# build the propagators with the given names, ordered by cost
+def makePropagators(names):
+    return sorted([PROPAGATORS[name]() for name in names], key=lambda propagator: propagator.cost)
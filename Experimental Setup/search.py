@@ -0,0 +1,272 @@
+# Non-recursive backtracking driver shared by the variants.
+#
+# It visits the same nodes in the same order as the recursive backtrack_search of each variant, but keeps its
+# choice points on an explicit stack instead of Python frames. A choice point holds the cell being assigned,
+# the values to try there with the position of the next one, and the undo information of the value currently
+# assigned. The search can stop after a number of nodes and resume later from where it stopped.
+#
+# The puzzle provides, besides count, is_answer, is_valid and choose_cell_to_assign:
+#   values_to_assign(index): the values to try at a cell, in order
+#   make_choice(index, value): assigns the value and returns (undo, consistent), where consistent is False
+#                              if the assignment already failed and the node below it should be skipped
+#   retract_choice(index, undo): takes back the assignment made by make_choice
+#
+# Restarts run the driver with a cutoff on its dead ends, nodes found inconsistent or assignments that failed
+# at once, taken from a schedule. When a run hits its cutoff, every value already tried and left on the
+# current path is known to fail under the assignments above it; those facts are handed to the puzzle as
+# nogoods before the search starts again from the root. A puzzle that supports restarts also provides
+# record_nogoods(nogoods), returning False if they prove it has no answer.
+#
+# Given a transposition table (see zobrist.py), the driver stores the hash of the state of every choice point
+# whose values all failed, and treats any node whose state is in the table as a dead end. The hash of the
+# puzzle must then be the Zobrist hash of its values.
+
+NO_CHOICE = object()
+
+class IterativeSearch:
+    def __init__(self, puzzle, transpositions=None):
+        self.puzzle = puzzle
+        self.transpositions = transpositions # table of failed states, None to search without one
+        self.stack = [] # choice points: [index, values to try, position of the next value, undo of the current value]
+        self.result = None # True once solved, False once every value has been tried
+        self.failures = 0 # dead ends met so far
+
+    # run the search for at most max_nodes more nodes and until it has met max_failures dead ends in all,
+    # returns the result, or None if it stopped before one
+    def run(self, max_nodes=None, max_failures=None):
+        puzzle = self.puzzle
+        nodes = 0
+        while self.result is None:
+            if max_nodes is not None and nodes >= max_nodes:
+                return None
+            if max_failures is not None and self.failures >= max_failures:
+                return None
+            nodes += 1
+            puzzle.count += 1
+            if puzzle.is_answer():
+                self.result = True
+                break
+            if self.transpositions is not None and self.transpositions.failed(hash(puzzle)):
+                self.record_failure(True)
+            elif puzzle.is_valid():
+                self.push_point(puzzle.choose_cell_to_assign())
+            else:
+                self.record_failure(False)
+            if not self.advance():
+                self.result = False
+        return self.result
+
+    # open a choice point on the chosen cell
+    def push_point(self, index):
+        self.stack.append([index, list(self.puzzle.values_to_assign(index)), 0, NO_CHOICE])
+
+    # count a dead end at the current node, known to fail from the transposition table if cut_off
+    def record_failure(self, cut_off):
+        self.failures += 1
+
+    # take back the current value of the deepest choice point and assign its next one, dropping choice points
+    # that have no value left, returns False once the stack is empty
+    def advance(self):
+        puzzle = self.puzzle
+        stack = self.stack
+        while stack:
+            point = stack[-1]
+            if point[3] is not NO_CHOICE:
+                puzzle.retract_choice(point[0], point[3])
+                point[3] = NO_CHOICE
+            if point[2] == len(point[1]):
+                if self.transpositions is not None:
+                    self.transpositions.store(hash(puzzle), len(stack) - 1)
+                stack.pop()
+                continue
+            value = point[1][point[2]]
+            point[2] += 1
+            point[3], consistent = puzzle.make_choice(point[0], value)
+            if consistent:
+                return True
+            self.failures += 1
+        return False
+
+    # take back every assignment on the stack, leaving the puzzle as it was before the search
+    def abandon(self):
+        while self.stack:
+            point = self.stack.pop()
+            if point[3] is not NO_CHOICE:
+                self.puzzle.retract_choice(point[0], point[3])
+
+    # nogoods proven by the current path, as lists of (index, value) assignments that cannot all hold: for every
+    # choice point, the current assignments of the choice points above it with each value it already left
+    def refuted_nogoods(self):
+        nogoods = []
+        decisions = []
+        for index, values, position, undo in self.stack:
+            tried = position - 1 if undo is not NO_CHOICE else position
+            for value in values[:tried]:
+                nogoods.append(decisions + [(index, value)])
+            if undo is NO_CHOICE:
+                break
+            decisions.append((index, values[position - 1]))
+        return nogoods
+
+# run a puzzle to the end with the iterative driver, returns True if it found an answer
+def iterativeSearch(puzzle):
+    return IterativeSearch(puzzle).run()
+
+# Conflict-directed backjumping on top of forward checking. Every choice point also keeps a conflict set, the
+# cells assigned above it that took part in the failures below it. A dead end adds to the deepest choice point
+# the assignments that emptied the domain of the wiped out cell. Once a choice point has tried all of its
+# values, the search jumps straight back to the deepest cell of its conflict set, together with the
+# assignments that pruned its own domain, and hands that set over to it. The choice points in between are
+# dropped without trying their other values, since none of them took part in the failure.
+#
+# The puzzle also provides:
+#   wipeout_culprits(): the assigned cells whose values emptied a domain when is_valid fails
+#   culprits(index): the assigned cells whose values were pruned from the domain of index
+#
+# A node cut off by the transposition table failed for reasons the table does not keep, so every cell on the
+# stack joins the conflict set and the search backtracks one level at a time from there.
+class BackjumpingSearch(IterativeSearch):
+    def __init__(self, puzzle, transpositions=None):
+        IterativeSearch.__init__(self, puzzle, transpositions)
+        self.depth_of = {} # depth in the stack of the choice point of each cell
+        self.backjumps = 0 # jumps over at least one choice point
+        self.levels_skipped = 0 # choice points dropped by those jumps
+
+    def push_point(self, index):
+        self.depth_of[index] = len(self.stack)
+        self.stack.append([index, list(self.puzzle.values_to_assign(index)), 0, NO_CHOICE, set()])
+
+    def record_failure(self, cut_off):
+        self.failures += 1
+        if self.stack:
+            if cut_off:
+                self.stack[-1][4].update(point[0] for point in self.stack)
+            else:
+                self.stack[-1][4].update(self.puzzle.wipeout_culprits())
+
+    def advance(self):
+        puzzle = self.puzzle
+        stack = self.stack
+        while stack:
+            point = stack[-1]
+            if point[3] is not NO_CHOICE:
+                puzzle.retract_choice(point[0], point[3])
+                point[3] = NO_CHOICE
+            if point[2] < len(point[1]):
+                value = point[1][point[2]]
+                point[2] += 1
+                point[3], consistent = puzzle.make_choice(point[0], value)
+                if consistent:
+                    return True
+                self.failures += 1
+                continue
+            if self.transpositions is not None:
+                self.transpositions.store(hash(puzzle), len(stack) - 1)
+            conflicts = point[4]
+            conflicts.update(puzzle.culprits(point[0]))
+            conflicts.discard(point[0])
+            stack.pop()
+            if not conflicts:
+                self.abandon()
+                return False
+            target = max(self.depth_of[index] for index in conflicts)
+            if target < len(stack) - 1:
+                self.backjumps += 1
+                self.levels_skipped += len(stack) - 1 - target
+            while len(stack) > target + 1:
+                skipped = stack.pop()
+                if skipped[3] is not NO_CHOICE:
+                    puzzle.retract_choice(skipped[0], skipped[3])
+            conflicts.discard(stack[target][0])
+            stack[target][4].update(conflicts)
+        return False
+
+# the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ... at position i, starting from 1
+def luby(i):
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    if (1 << k) - 1 == i:
+        return 1 << (k - 1)
+    return luby(i - (1 << (k - 1)) + 1)
+
+# dead end cutoffs of the Luby restart schedule
+def lubyCutoffs(base=16):
+    i = 1
+    while True:
+        yield base * luby(i)
+        i += 1
+
+# dead end cutoffs growing geometrically
+def geometricCutoffs(base=16, factor=1.5):
+    cutoff = float(base)
+    while True:
+        yield int(cutoff)
+        cutoff *= factor
+
+RESTARTS = {"luby": lubyCutoffs, "geometric": geometricCutoffs}
+
+# The cutoffs are an endless schedule such as lubyCutoffs or geometricCutoffs, so the search only stops once a
+# run finds an answer or proves there is none.
+class RestartingSearch:
+    def __init__(self, puzzle, cutoffs, transpositions=None):
+        self.puzzle = puzzle
+        self.cutoffs = cutoffs # dead end cutoff of each run
+        self.transpositions = transpositions # table of failed states, shared by every run
+        self.restarts = 0
+        self.nogoods = 0 # number of nogoods handed to the puzzle
+
+    # run the search until it finds an answer or proves there is none, returns True if it found an answer
+    def run(self):
+        for cutoff in self.cutoffs:
+            search = IterativeSearch(self.puzzle, self.transpositions)
+            result = search.run(max_failures=cutoff)
+            if result is not None:
+                return result
+            nogoods = search.refuted_nogoods()
+            search.abandon()
+            self.restarts += 1
+            self.nogoods += len(nogoods)
+            if not self.puzzle.record_nogoods(nogoods):
+                return False
+
+# Nogoods over the assignments of a flat list of cell values, each one a set of (index, value) assignments that
+# cannot all hold. Every nogood watches two of its assignments that do not hold yet, so it is only visited when
+# one of them is made; once every other assignment holds, the remaining one is forbidden.
+class NogoodStore:
+    def __init__(self, values, size=9):
+        self.values = values # flat list of cell values, 0 if unassigned
+        self.size = size # number of values of a cell
+        self.nogoods = [] # literals (index * size + value - 1) of each nogood, the two watched ones first
+        self.watches = [[] for literal in range(len(values) * size)] # nogoods watching each literal
+
+    def holds(self, literal):
+        return self.values[literal // self.size] == literal % self.size + 1
+
+    # add a nogood of at least two assignments, none of which holds
+    def add(self, assignments):
+        nogood_index = len(self.nogoods)
+        literals = [index * self.size + value - 1 for index, value in assignments]
+        self.nogoods.append(literals)
+        self.watches[literals[0]].append(nogood_index)
+        self.watches[literals[1]].append(nogood_index)
+
+    # called once value has been assigned at index, returns the (index, value) assignments it forbids
+    def assigned(self, index, value):
+        literal = index * self.size + value - 1
+        forbidden = []
+        kept = []
+        for nogood_index in self.watches[literal]:
+            literals = self.nogoods[nogood_index]
+            if literals[0] == literal:
+                literals[0], literals[1] = literals[1], literal
+            for k in range(2, len(literals)):
+                if not self.holds(literals[k]):
+                    literals[1], literals[k] = literals[k], literal
+                    self.watches[literals[1]].append(nogood_index)
+                    break
+            else:
+                kept.append(nogood_index)
+                forbidden.append((literals[0] // self.size, literals[0] % self.size + 1))
+        self.watches[literal] = kept
+        return forbidden
@@ -0,0 +1,116 @@
+from math import sqrt
+
+# Precomputed tables for a Sudoku board, built once per size and shared by every variant.
+#
+# Cells are addressed by a flat index (row * N + col). Units are numbered 0 to N-1 for rows, N to 2N-1 for
+# collumns and 2N to 3N-1 for boxes. Domains of the bitmask engines use bit (v - 1) for value v.
+#
+# The module level names are the tables of the standard 9x9 board. Variant (F) also solves 16x16, 25x25 and
+# 36x36 boards, and reads the tables of its board through a Board object instead.
+
+# lookup tables indexed by domain mask are built up to this many values, larger boards compute them instead
+MASK_TABLE_LIMIT = 12
+
+# number of possible values inside a domain mask, indexed like a list
+class BitCounts(object):
+    def __getitem__(self, mask):
+        return bin(mask).count("1")
+
+# values inside a domain mask, in increasing order, indexed like a list
+class MaskValues(object):
+    def __getitem__(self, mask):
+        values = []
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            values.append(bit.bit_length())
+        return values
+
+class Board(object):
+    def __init__(self, size):
+        box_size = int(round(sqrt(size)))
+        if box_size * box_size != size:
+            raise ValueError("Board size must be a square number, got " + str(size))
+        self.size = size # number of values, and of cells in every unit
+        self.box_size = box_size
+        self.cell_count = size * size
+        self.unit_count = 3 * size
+        self.cells = list(range(self.cell_count))
+        self.values = list(range(1, size + 1))
+
+        self.row_of = [index // size for index in self.cells]
+        self.col_of = [index % size for index in self.cells]
+        self.box_of = [(index // (size * box_size)) * box_size + (index % size) // box_size for index in self.cells]
+
+        self.rows = [[row * size + col for col in range(size)] for row in range(size)]
+        self.cols = [[row * size + col for row in range(size)] for col in range(size)]
+        self.boxes = [[] for box in range(size)]
+        for index in self.cells:
+            self.boxes[self.box_of[index]].append(index)
+        self.units = self.rows + self.cols + self.boxes
+
+        # N*N-bit set of the cells of each unit
+        self.unit_masks = [sum(1 << index for index in unit) for unit in self.units]
+
+        # the row, collumn and box unit of each cell
+        self.units_of = [(self.row_of[index], size + self.col_of[index], 2 * size + self.box_of[index])
+                         for index in self.cells]
+
+        # the cells sharing a unit with each cell, in increasing order
+        self.peers = [sorted(set(self.rows[self.row_of[index]] + self.cols[self.col_of[index]]
+                                 + self.boxes[self.box_of[index]]) - set([index])) for index in self.cells]
+        self.peer_sets = [frozenset(peers) for peers in self.peers]
+
+        # bit of each cell inside an N*N-bit set of cells
+        self.cell_bit = [1 << index for index in self.cells]
+
+        # N*N-bit set of the peers of each cell
+        self.peer_masks = [sum(self.cell_bit[peer] for peer in peers) for peers in self.peers]
+
+        self.all_values = (1 << size) - 1
+
+        # value represented by a single-bit mask
+        self.bit_to_value = dict((1 << (value - 1), value) for value in self.values)
+        self.value_to_bit = [0] + [1 << (value - 1) for value in self.values]
+
+        if size <= MASK_TABLE_LIMIT:
+            self.popcount = [bin(mask).count("1") for mask in range(self.all_values + 1)]
+            self.mask_values = [[value for value in self.values if mask & self.value_to_bit[value]]
+                                for mask in range(self.all_values + 1)]
+        else:
+            self.popcount = BitCounts()
+            self.mask_values = MaskValues()
+
+BOARDS = {}
+
+# the tables of the board with size values, built on first use
+def getBoard(size):
+    if size not in BOARDS:
+        BOARDS[size] = Board(size)
+    return BOARDS[size]
+
+STANDARD_BOARD = getBoard(9)
+
+CELLS = STANDARD_BOARD.cells
+
+ROW_OF = STANDARD_BOARD.row_of
+COL_OF = STANDARD_BOARD.col_of
+BOX_OF = STANDARD_BOARD.box_of
+
+ROWS = STANDARD_BOARD.rows
+COLS = STANDARD_BOARD.cols
+BOXES = STANDARD_BOARD.boxes
+UNITS = STANDARD_BOARD.units
+
+UNIT_MASKS = STANDARD_BOARD.unit_masks
+UNITS_OF = STANDARD_BOARD.units_of
+PEERS = STANDARD_BOARD.peers
+PEER_SETS = STANDARD_BOARD.peer_sets
+CELL_BIT = STANDARD_BOARD.cell_bit
+PEER_MASKS = STANDARD_BOARD.peer_masks
+
+ALL_VALUES = STANDARD_BOARD.all_values
+POPCOUNT = STANDARD_BOARD.popcount
+BIT_TO_VALUE = STANDARD_BOARD.bit_to_value
+VALUE_TO_BIT = STANDARD_BOARD.value_to_bit
+MASK_VALUES = STANDARD_BOARD.mask_values
@@ -0,0 +1,52 @@
+from tables import CELLS, UNITS, UNITS_OF
+
+# Constraint weights for the dom/wdeg variable ordering of variants (B) to (E).
+#
+# Every unit (row, collumn or box) carries a weight, starting at 1, which goes up by one each time the unit
+# takes part in a domain wipeout: an assignment or a revised arc that empties a domain bumps the units shared
+# by the emptied cell and the cell that emptied it. Weights are kept when the search backtracks, so the units
+# that keep failing end up dominating the ordering.
+#
+# The weighted degree of a cell is the sum of the weights of its units that still hold another unassigned
+# cell. It is kept for every cell and only changes when a unit goes down to or back up from a single
+# unassigned cell, or when a weight goes up, so choosing a cell reads it instead of recomputing it. While
+# no weight has moved, dom/wdeg is close to the domain size alone, and the variants break ties by degree.
+
+class ConstraintWeights:
+    def __init__(self, values):
+        self.weights = [1] * 27
+        self.free = [sum(1 for index in unit if values[index] == 0) for unit in UNITS] # unassigned cells per unit
+        self.weighted_degrees = [sum(1 for unit in UNITS_OF[index] if self.free[unit] > 1) for index in CELLS]
+        self.bumps = 0 # number of weight increases
+
+    def assign(self, index):
+        for unit in UNITS_OF[index]:
+            self.free[unit] -= 1
+            if self.free[unit] == 1:
+                self.add_to_unit(unit, -self.weights[unit])
+
+    def unassign(self, index):
+        for unit in UNITS_OF[index]:
+            self.free[unit] += 1
+            if self.free[unit] == 2:
+                self.add_to_unit(unit, self.weights[unit])
+
+    def add_to_unit(self, unit, change):
+        for cell in UNITS[unit]:
+            self.weighted_degrees[cell] += change
+
+    # raise the weight of the units shared by a wiped out cell and the cell whose value emptied it
+    def bump(self, wiped, culprit):
+        for unit in UNITS_OF[wiped]:
+            if unit in UNITS_OF[culprit]:
+                self.weights[unit] += 1
+                self.bumps += 1
+                if self.free[unit] > 1:
+                    self.add_to_unit(unit, 1)
+
+    # dom/wdeg of an unassigned cell, cells without any unassigned peer come last
+    def ratio(self, domain_size, index):
+        weighted_degree = self.weighted_degrees[index]
+        if weighted_degree <= 0:
+            return float("inf")
+        return domain_size / float(weighted_degree)
@@ -0,0 +1,84 @@
+import random
+from tables import STANDARD_BOARD
+
+# Zobrist hashing of the cell values, and a transposition table of the states proven to fail.
+#
+# Every (cell, value) pair gets a random 63-bit key, and the hash of a state is the XOR of the keys of its
+# assigned cells. Assigning or unassigning a value XORs a single key, so the variants keep the hash of their
+# current state up to date in assign and undo_assign instead of rebuilding it. getrandbits returns a long,
+# but 63 bits fit a plain int on 64-bit builds, so the keys are turned into ints to keep the XORs cheap.
+#
+# A state fails when no answer extends its assignments, which only depends on the values, not on the path
+# that reached them or on how much the domains were propagated. The search driver stores a state once every
+# value of its choice point failed and skips any node whose state is already in the table, including the
+# nodes met again after a restart.
+
+ZOBRIST_SEED = 3243
+
+# key of each value at each cell of a board, 0 for an unassigned cell
+def zobristKeys(board=STANDARD_BOARD, seed=ZOBRIST_SEED):
+    generator = random.Random(seed)
+    return [[0] + [int(generator.getrandbits(63)) for value in board.values] for index in board.cells]
+
+ZOBRIST = zobristKeys()
+
+KEYS = {9: ZOBRIST}
+
+# the keys of the board with size values, built on first use
+def boardKeys(board):
+    if board.size not in KEYS:
+        KEYS[board.size] = zobristKeys(board)
+    return KEYS[board.size]
+
+# hash of a flat list of cell values
+def zobristHash(values, keys=ZOBRIST):
+    key = 0
+    for index in range(len(values)):
+        key ^= keys[index][values[index]]
+    return key
+
+# Bounded table of failed states. The key picks a bucket of two entries: the first keeps the failure found
+# at the smallest depth, which cut off the largest subtree, and the second always takes the latest failure.
+# A new failure at least as shallow as the first entry moves it down to the second, evicting what was there.
+class TranspositionTable:
+    def __init__(self, capacity=1 << 16):
+        self.buckets = max(1, capacity // 2)
+        self.keys = [None] * (2 * self.buckets)
+        self.depths = [0] * (2 * self.buckets)
+        self.stores = 0
+        self.hits = 0
+        self.evictions = 0
+
+    # record that the state with this key fails, found with depth assignments made by the search
+    def store(self, key, depth):
+        self.stores += 1
+        slot = 2 * (key % self.buckets)
+        if self.keys[slot] == key:
+            self.depths[slot] = min(self.depths[slot], depth)
+            return
+        if self.keys[slot + 1] == key:
+            self.keys[slot + 1] = None
+        if self.keys[slot] is None or depth <= self.depths[slot]:
+            if self.keys[slot] is not None:
+                self.replace(slot + 1, self.keys[slot], self.depths[slot])
+            self.keys[slot] = key
+            self.depths[slot] = depth
+        else:
+            self.replace(slot + 1, key, depth)
+
+    def replace(self, slot, key, depth):
+        if self.keys[slot] is not None:
+            self.evictions += 1
+        self.keys[slot] = key
+        self.depths[slot] = depth
+
+    # returns True if the state with this key is known to fail
+    def failed(self, key):
+        slot = 2 * (key % self.buckets)
+        if self.keys[slot] == key or self.keys[slot + 1] == key:
+            self.hits += 1
+            return True
+        return False
+
+    def __len__(self):
+        return sum(1 for key in self.keys if key is not None)